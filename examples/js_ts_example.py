@@ -2,7 +2,9 @@
 JavaScript/TypeScript 解析器示例
 """
 
-from a_brick_code_analyzer import ParserFactory
+from collections import Counter
+
+from a_brick_code_analyzer import ParserFactory, NodeType
 
 
 def main():
@@ -107,15 +109,12 @@ export class UserListComponent implements OnInit {
         print(f"导入语句: {len(js_result.imports)}")
         print(f"代码节点: {len(js_result.nodes)}")
 
-        functions = [node for node in js_result.nodes if node.node_type.name == 'FUNCTION']
-        methods = [node for node in js_result.nodes if node.node_type.name == 'METHOD']
-        classes = [node for node in js_result.nodes if node.node_type.name == 'CLASS']
-        variables = [node for node in js_result.nodes if node.node_type.name == 'VARIABLE']
+        counts = Counter(node.node_type for node in js_result.nodes)
 
-        print(f"  - 函数: {len(functions)}")
-        print(f"  - 方法: {len(methods)}")
-        print(f"  - 类: {len(classes)}")
-        print(f"  - 变量: {len(variables)}")
+        print(f"  - 函数: {counts[NodeType.FUNCTION]}")
+        print(f"  - 方法: {counts[NodeType.METHOD]}")
+        print(f"  - 类: {counts[NodeType.CLASS]}")
+        print(f"  - 变量: {counts[NodeType.VARIABLE]}")
 
         if js_result.errors:
             print(f"错误: {js_result.errors}")
@@ -134,15 +133,12 @@ export class UserListComponent implements OnInit {
         print(f"导入语句: {len(ts_result.imports)}")
         print(f"代码节点: {len(ts_result.nodes)}")
 
-        functions = [node for node in ts_result.nodes if node.node_type.name == 'FUNCTION']
-        methods = [node for node in ts_result.nodes if node.node_type.name == 'METHOD']
-        classes = [node for node in ts_result.nodes if node.node_type.name == 'CLASS']
-        variables = [node for node in ts_result.nodes if node.node_type.name == 'VARIABLE']
+        counts = Counter(node.node_type for node in ts_result.nodes)
 
-        print(f"  - 函数: {len(functions)}")
-        print(f"  - 方法: {len(methods)}")
-        print(f"  - 类: {len(classes)}")
-        print(f"  - 变量: {len(variables)}")
+        print(f"  - 函数: {counts[NodeType.FUNCTION]}")
+        print(f"  - 方法: {counts[NodeType.METHOD]}")
+        print(f"  - 类: {counts[NodeType.CLASS]}")
+        print(f"  - 变量: {counts[NodeType.VARIABLE]}")
 
         if ts_result.errors:
             print(f"错误: {ts_result.errors}")
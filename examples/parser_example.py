@@ -44,7 +44,7 @@ class Calculator:
     print(f"\n发现 {len(result.nodes)} 个代码节点:")
 
     for node in result.nodes:
-        print(f"  - {node.node_type.value}: {node.name} "
+        print(f"  - {node.node_type.label}: {node.name} "
               f"(行 {node.line_start}-{node.line_end}, 复杂度: {node.complexity})")
         if node.params:
             print(f"    参数: {', '.join(node.params)}")
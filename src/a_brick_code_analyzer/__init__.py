@@ -3,28 +3,52 @@ AST 解析模块
 提供代码解析、结构分析、规则引擎和 LLM 集成功能
 """
 
-from .base import BaseParser, ParseResult, NodeType, CodeNode
+import importlib
+
+from .base import BaseParser, ParseResult, NodeType, CodeNode, NodeColumns, Edit
 from .python_parser import PythonParser
 from .factory import ParserFactory
-from .rules import (
-    RuleEngine,
-    RuleConfig,
-    BaseRule,
-    NodeRule,
-    Severity,
-    RuleViolation,
-    LintResult,
-    LintReport,
-)
-from .llm import (
-    CodeAnalyzer,
-    OllamaClient,
-    LLMConfig,
-    LLMResponse,
-    AnalysisType,
-    RECOMMENDED_MODELS,
-    select_model_interactive,
-)
+
+# 延迟导出（PEP 562）：规则引擎和 LLM 子模块只在首次访问时导入，
+# 只用解析器的场景不必为它们付出导入开销
+_LAZY_EXPORTS = {
+    # 持久化缓存
+    'AstCache': '.ast_cache',
+
+    # 规则引擎
+    'RuleEngine': '.rules',
+    'RuleConfig': '.rules',
+    'BaseRule': '.rules',
+    'NodeRule': '.rules',
+    'Severity': '.rules',
+    'RuleViolation': '.rules',
+    'LintResult': '.rules',
+    'LintReport': '.rules',
+
+    # LLM 集成
+    'CodeAnalyzer': '.llm',
+    'OllamaClient': '.llm',
+    'LLMConfig': '.llm',
+    'LLMResponse': '.llm',
+    'AnalysisType': '.llm',
+    'RECOMMENDED_MODELS': '.llm',
+    'select_model_interactive': '.llm',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     # 解析器
@@ -32,8 +56,11 @@ __all__ = [
     'ParseResult',
     'NodeType',
     'CodeNode',
+    'NodeColumns',
+    'Edit',
     'PythonParser',
     'ParserFactory',
+    'AstCache',
 
     # 规则引擎
     'RuleEngine',
@@ -0,0 +1,53 @@
+"""
+批量规则检查快速路径
+在列式节点视图（见 base.NodeColumns）上筛选超限节点的下标
+"""
+
+# 可选的 NumPy 加速：array.array 支持缓冲区协议，
+# frombuffer 零拷贝建视图后比较和筛选都在 C 层完成
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _over_threshold_py(node_types, values, wanted, limit):
+    """纯 Python 实现：wanted 类型中 values > limit 的下标"""
+    return [
+        i for i, t in enumerate(node_types)
+        if t in wanted and values[i] > limit
+    ]
+
+
+def _over_span_py(node_types, starts, ends, wanted, limit):
+    """纯 Python 实现：wanted 类型中行数（end - start + 1）> limit 的下标"""
+    return [
+        i for i, t in enumerate(node_types)
+        if t in wanted and ends[i] - starts[i] + 1 > limit
+    ]
+
+
+if NUMPY_AVAILABLE:
+
+    def over_threshold(node_types, values, wanted, limit):
+        """返回 wanted 类型中 values > limit 的下标列表"""
+        t = np.frombuffer(node_types, dtype=np.uint8)
+        v = np.frombuffer(values, dtype=np.intc)
+        mask = v > limit
+        mask &= np.isin(t, np.asarray(wanted, dtype=np.uint8))
+        return np.flatnonzero(mask).tolist()
+
+    def over_span(node_types, starts, ends, wanted, limit):
+        """返回 wanted 类型中行数（end - start + 1）> limit 的下标列表"""
+        t = np.frombuffer(node_types, dtype=np.uint8)
+        s = np.frombuffer(starts, dtype=np.intc)
+        e = np.frombuffer(ends, dtype=np.intc)
+        mask = e - s + 1 > limit
+        mask &= np.isin(t, np.asarray(wanted, dtype=np.uint8))
+        return np.flatnonzero(mask).tolist()
+
+else:
+
+    over_threshold = _over_threshold_py
+    over_span = _over_span_py
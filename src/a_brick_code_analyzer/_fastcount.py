@@ -0,0 +1,82 @@
+"""
+行统计快速路径
+单次扫描统计总行数/代码行/注释行/空行
+"""
+
+import re
+
+# 可选的 Numba 加速（需要 numba + numpy）
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# 空白行 / 注释行（多行模式，整块源码一次 findall）
+_BLANK_LINE_RE = re.compile(r'(?m)^[ \t\r\f\v]*$')
+_COMMENT_LINE_RE = re.compile(r'(?m)^[ \t\r\f\v]*#')
+
+
+def _count_python_lines_py(code: str):
+    """
+    纯 Python 实现
+
+    不切分行列表，总行数走 str.count，
+    空行/注释行用预编译的多行正则整体匹配，都在 C 层完成
+    """
+    total_lines = code.count('\n') + 1
+    blank_lines = len(_BLANK_LINE_RE.findall(code))
+    comment_lines = len(_COMMENT_LINE_RE.findall(code))
+    code_lines = total_lines - blank_lines - comment_lines
+    return total_lines, code_lines, comment_lines, blank_lines
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _classify_bytes(buf):  # pragma: no cover - 需要 numba
+        """逐字节扫描，返回 (总行数, 空行数, 注释行数)"""
+        total_lines = 0
+        blank_lines = 0
+        comment_lines = 0
+        line_blank = True
+        first_byte = 0  # 当前行第一个非空白字节
+
+        for i in range(buf.size):
+            b = buf[i]
+            if b == 10:  # '\n'
+                total_lines += 1
+                if line_blank:
+                    blank_lines += 1
+                elif first_byte == 35:  # '#'
+                    comment_lines += 1
+                line_blank = True
+                first_byte = 0
+            elif b != 32 and b != 9 and b != 13:  # 空格/制表符/回车
+                if line_blank:
+                    line_blank = False
+                    first_byte = b
+
+        # 最后一行（即使没有结尾换行符也要计入）
+        total_lines += 1
+        if line_blank:
+            blank_lines += 1
+        elif first_byte == 35:
+            comment_lines += 1
+
+        return total_lines, blank_lines, comment_lines
+
+    def count_python_lines(code: str):
+        """统计 Python 源码行数，返回 (总行数, 代码行, 注释行, 空行)"""
+        buf = np.frombuffer(code.encode('utf-8'), dtype=np.uint8)
+        total_lines, blank_lines, comment_lines = _classify_bytes(buf)
+        code_lines = total_lines - blank_lines - comment_lines
+        return total_lines, code_lines, comment_lines, blank_lines
+
+else:
+
+    def count_python_lines(code: str):
+        """统计 Python 源码行数，返回 (总行数, 代码行, 注释行, 空行)"""
+        return _count_python_lines_py(code)
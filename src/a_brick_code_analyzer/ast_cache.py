@@ -0,0 +1,126 @@
+"""
+持久化 AST 缓存
+以 (路径, 内容 SHA-256) 为键将解析结果存入 SQLite，跨进程复用
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Optional
+
+from .base import ParseResult
+
+
+# 默认缓存数据库位置
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'a_brick_code_analyzer', 'ast_cache.db')
+
+
+class AstCache:
+    """
+    ParseResult 的持久化缓存
+
+    键为 (文件路径, 内容的 SHA-256 摘要)：内容不变即命中，
+    热会话中重复分析同一代码库时跳过整个解析阶段，
+    只付出一次哈希的成本。
+    payload 为 pickle 序列化的 ParseResult（剥离不可序列化的语法树）。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        # 连接不跨线程共享，按线程懒建
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        """获取（必要时创建）当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            # WAL + NORMAL：写入不阻塞读取，且避免每次提交都 fsync
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ast_cache ("
+                "path TEXT, sha BLOB, payload BLOB, "
+                "PRIMARY KEY (path, sha))")
+            self._local.conn = conn
+        return conn
+
+    def get(self, path: str, digest: bytes) -> Optional[ParseResult]:
+        """
+        查询缓存
+
+        Args:
+            path: 文件路径
+            digest: 文件内容的 SHA-256 摘要
+
+        Returns:
+            Optional[ParseResult]: 命中时返回反序列化的解析结果，否则 None
+        """
+        try:
+            row = self._conn().execute(
+                "SELECT payload FROM ast_cache WHERE path = ? AND sha = ?",
+                (path, digest)).fetchone()
+            if row is None:
+                return None
+            return pickle.loads(row[0])
+        except Exception:
+            # 缓存损坏或数据库不可用时视为未命中
+            return None
+
+    def put(self, path: str, digest: bytes, result: ParseResult):
+        """
+        写入缓存
+
+        Args:
+            path: 文件路径
+            digest: 文件内容的 SHA-256 摘要
+            result: 解析结果
+        """
+        # 语法树（tree-sitter Tree）无法 pickle，序列化时临时剥离
+        tree = result._tree
+        result._tree = None
+        try:
+            payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            result._tree = tree
+
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO ast_cache (path, sha, payload) "
+                "VALUES (?, ?, ?)",
+                (path, digest, payload))
+            conn.commit()
+        except sqlite3.Error:
+            # 缓存写入失败不影响解析结果
+            pass
+
+    def clear(self):
+        """清空缓存"""
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM ast_cache")
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+
+# 进程内共享的默认缓存实例
+_default_cache: Optional[AstCache] = None
+
+
+def get_default_cache() -> AstCache:
+    """获取（必要时创建）默认的持久化 AST 缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AstCache()
+    return _default_cache
@@ -2,23 +2,34 @@
 基础解析器抽象类和数据结构
 """
 
+import hashlib
+import os
+import sys
+import threading
 from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
-from enum import Enum
+from typing import List, Dict, Any, Optional, Tuple
+from enum import IntEnum
 
 
-class NodeType(Enum):
-    """AST 节点类型"""
-    FUNCTION = "function"
-    CLASS = "class"
-    METHOD = "method"
-    VARIABLE = "variable"
-    IMPORT = "import"
-    MODULE = "module"
+class NodeType(IntEnum):
+    """AST 节点类型（整数枚举，比较为 C 速度的 int 比较）"""
+    FUNCTION = 0
+    CLASS = 1
+    METHOD = 2
+    VARIABLE = 3
+    IMPORT = 4
+    MODULE = 5
 
+    @property
+    def label(self) -> str:
+        """小写的可读名称，如 'function'"""
+        return self.name.lower()
 
-@dataclass
+
+@dataclass(slots=True)
 class CodeNode:
     """代码节点信息"""
     node_type: NodeType
@@ -32,7 +43,86 @@ class CodeNode:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class Edit:
+    """
+    一次源码编辑（字节偏移 + (行, 列) 坐标）
+
+    与 tree-sitter 的 TSInputEdit 对应，供增量重解析使用
+    """
+    start_byte: int
+    old_end_byte: int
+    new_end_byte: int
+    start_point: Tuple[int, int]
+    old_end_point: Tuple[int, int]
+    new_end_point: Tuple[int, int]
+
+
+@dataclass(slots=True)
+class NodeColumns:
+    """
+    节点的列式视图（Struct of Arrays）
+
+    将 nodes 中的数值字段拆成紧凑的并行数组，
+    批量过滤/统计时只需扫描单列，而不是逐个访问 CodeNode 属性。
+    下标与 ParseResult.nodes 一一对应。
+    """
+    node_types: array       # 'B'：NodeType 的整数值
+    line_starts: array      # 'i'
+    line_ends: array        # 'i'
+    complexities: array     # 'i'
+    param_counts: array     # 'i'：len(params)，未过滤 self/cls
+    names: List[str]
+
+    @classmethod
+    def from_nodes(cls, nodes: List['CodeNode']) -> 'NodeColumns':
+        """从 CodeNode 列表单次遍历构建列式视图"""
+        node_types = array('B')
+        line_starts = array('i')
+        line_ends = array('i')
+        complexities = array('i')
+        param_counts = array('i')
+        names = []
+        for node in nodes:
+            node_types.append(node.node_type)
+            line_starts.append(node.line_start)
+            line_ends.append(node.line_end)
+            complexities.append(node.complexity)
+            param_counts.append(len(node.params))
+            names.append(node.name)
+        return cls(node_types, line_starts, line_ends, complexities,
+                   param_counts, names)
+
+    def indices_of_type(self, node_type: NodeType) -> List[int]:
+        """返回指定类型节点的下标列表"""
+        type_id = int(node_type)
+        return [i for i, t in enumerate(self.node_types) if t == type_id]
+
+    def indices_over_complexity(self, threshold: int) -> List[int]:
+        """返回复杂度超过阈值的节点下标列表"""
+        return [i for i, c in enumerate(self.complexities) if c > threshold]
+
+    def indices_by_complexity(
+        self,
+        node_types: Tuple[NodeType, ...],
+        threshold: int
+    ) -> List[int]:
+        """
+        返回指定类型中复杂度超过阈值的节点下标，按复杂度降序
+
+        只扫描类型列和复杂度列两条紧凑数组，
+        排序键直接取列元素，不触碰 CodeNode 对象
+        """
+        wanted = {int(t) for t in node_types}
+        hits = [
+            i for i, t in enumerate(self.node_types)
+            if t in wanted and self.complexities[i] > threshold
+        ]
+        hits.sort(key=self.complexities.__getitem__, reverse=True)
+        return hits
+
+
+@dataclass(slots=True)
 class ParseResult:
     """解析结果"""
     file_path: str
@@ -45,26 +135,111 @@ class ParseResult:
     blank_lines: int = 0
     errors: List[str] = field(default_factory=list)
 
+    # 按类型分桶的节点缓存（懒构建，见 get_by_type）
+    _by_type: Optional[Dict[NodeType, List[CodeNode]]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    # 列式视图缓存（懒构建，见 get_columns）
+    _columns: Optional[NodeColumns] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    # reserve/add_node 写入游标
+    _node_idx: int = field(default=0, init=False, repr=False, compare=False)
+
+    # 底层解析树（tree-sitter Tree 等，供增量重解析复用）
+    _tree: Optional[Any] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 驻留文件路径字符串：同一文件的多次解析/多条违规共享一份
+        self.file_path = sys.intern(self.file_path)
+
+    def reserve(self, count: int):
+        """
+        预分配 nodes 列表
+
+        按估计的节点数一次性分配，配合 add_node 索引写入，
+        避免逐个 append 触发的多次列表扩容拷贝
+        """
+        self.nodes = [None] * count
+        self._node_idx = 0
+
+    def add_node(self, node: CodeNode):
+        """写入一个节点（预分配空间用尽后退化为 append）"""
+        idx = self._node_idx
+        if idx < len(self.nodes):
+            self.nodes[idx] = node
+        else:
+            self.nodes.append(node)
+        self._node_idx = idx + 1
+
+    def finalize_nodes(self):
+        """截断未使用的预分配空间（reserve 估计偏大时调用）"""
+        del self.nodes[self._node_idx:]
+
+    def get_by_type(self, node_type: NodeType) -> List[CodeNode]:
+        """
+        按类型获取节点
+
+        首次调用时单次遍历 nodes 构建类型桶并缓存，
+        避免每种类型各扫描一遍节点列表
+        """
+        buckets = self._by_type
+        if buckets is None:
+            buckets = {}
+            for node in self.nodes:
+                buckets.setdefault(node.node_type, []).append(node)
+            self._by_type = buckets
+        return buckets.get(node_type, [])
+
+    def get_columns(self) -> NodeColumns:
+        """
+        获取节点的列式视图
+
+        首次调用时从 nodes 构建并缓存，适合只关心
+        类型/行号/复杂度等数值列的批量分析
+        """
+        if self._columns is None:
+            self._columns = NodeColumns.from_nodes(self.nodes)
+        return self._columns
+
     def get_functions(self) -> List[CodeNode]:
         """获取所有函数节点"""
-        return [node for node in self.nodes if node.node_type == NodeType.FUNCTION]
+        return self.get_by_type(NodeType.FUNCTION)
 
     def get_classes(self) -> List[CodeNode]:
         """获取所有类节点"""
-        return [node for node in self.nodes if node.node_type == NodeType.CLASS]
+        return self.get_by_type(NodeType.CLASS)
 
     def get_methods(self) -> List[CodeNode]:
         """获取所有方法节点"""
-        return [node for node in self.nodes if node.node_type == NodeType.METHOD]
+        return self.get_by_type(NodeType.METHOD)
 
 
 class BaseParser(ABC):
     """解析器基类"""
 
-    @abstractmethod
+    # parse_file 结果缓存：(解析器类, 绝对路径, mtime_ns, size) -> ParseResult
+    # 文件未变化时重复解析直接命中，LRU 淘汰最旧条目
+    _parse_cache: 'OrderedDict[Tuple, ParseResult]' = OrderedDict()
+    _PARSE_CACHE_MAX = 256
+
+    # parse 结果缓存：(解析器类, 路径, 内容 SHA-256) -> ParseResult
+    # 相同源码字符串重复解析（REPL、测试、编辑器轮询）直接命中
+    _code_cache: 'OrderedDict[Tuple, ParseResult]' = OrderedDict()
+    _CODE_CACHE_MAX = 512
+
+    # 两个缓存共用的锁：命中端 get -> move_to_end 和淘汰端 popitem
+    # 并发交错会让 move_to_end 对刚被淘汰的键抛 KeyError
+    # （analyze_many 等走线程池并发进入 parse）；只保护字典簿记，
+    # 解析本身在锁外执行
+    _cache_lock = threading.Lock()
+
     def parse(self, code: str, file_path: str = "") -> ParseResult:
         """
-        解析代码
+        解析代码（带内容寻址缓存）
+
+        以源码内容的 SHA-256 为键缓存解析结果：
+        哈希远比重建 AST 便宜，相同代码串只解析一次
 
         Args:
             code: 源代码字符串
@@ -73,12 +248,147 @@ class BaseParser(ABC):
         Returns:
             ParseResult: 解析结果
         """
-        pass
+        cache = BaseParser._code_cache
+        key = (type(self), file_path,
+               hashlib.sha256(code.encode('utf-8')).digest())
+        with BaseParser._cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                return cached
+
+        result = self._do_parse(code, file_path)
+        with BaseParser._cache_lock:
+            cache[key] = result
+            if len(cache) > self._CODE_CACHE_MAX:
+                cache.popitem(last=False)
+        return result
+
+    @classmethod
+    def clear_caches(cls):
+        """
+        清空解析结果缓存（parse 与 parse_file 共两个）
+
+        缓存挂在 BaseParser 上、所有解析器共享，需要缓存隔离的
+        场景（测试、长驻进程的显式回收）可调用
+        """
+        with BaseParser._cache_lock:
+            BaseParser._code_cache.clear()
+            BaseParser._parse_cache.clear()
 
     @abstractmethod
+    def _do_parse(self, code: str, file_path: str = "") -> ParseResult:
+        """
+        实际执行解析（子类实现，勿直接调用）
+
+        Args:
+            code: 源代码字符串
+            file_path: 文件路径（可选）
+
+        Returns:
+            ParseResult: 解析结果
+        """
+        pass
+
+    def parse_incremental(
+        self,
+        prev: ParseResult,
+        new_code: str,
+        edits: List[Edit]
+    ) -> ParseResult:
+        """
+        在上次解析结果的基础上增量重解析
+
+        默认实现直接完整重新解析；
+        底层引擎支持增量模式的解析器（如 tree-sitter）可覆盖
+
+        Args:
+            prev: 上次的解析结果
+            new_code: 编辑后的完整源代码
+            edits: 自上次解析以来的编辑列表
+
+        Returns:
+            ParseResult: 解析结果
+        """
+        return self.parse(new_code, prev.file_path)
+
+    def parse_bytes(self, data: bytes, file_path: str = "") -> ParseResult:
+        """
+        解析字节串形式的源代码
+
+        默认实现解码后委托给 parse；
+        直接消费字节的解析器（如 tree-sitter）可覆盖以跳过解码
+
+        Args:
+            data: 源代码字节串（UTF-8）
+            file_path: 文件路径（可选）
+
+        Returns:
+            ParseResult: 解析结果
+        """
+        return self.parse(data.decode('utf-8'), file_path)
+
     def parse_file(self, file_path: str) -> ParseResult:
         """
-        解析文件
+        解析文件（带缓存）
+
+        两级缓存：
+        进程内以 (路径, mtime, size) 为键，文件未修改时直接命中（快速预检）；
+        未命中时以内容 SHA-256 查持久化 SQLite 缓存（见 ast_cache），
+        跨进程复用解析结果，只付出一次哈希的成本
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            ParseResult: 解析结果
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            # 无法 stat（不存在/无权限等）时走原始路径，由子类报告错误
+            return self._do_parse_file(file_path)
+
+        cache = BaseParser._parse_cache
+        abs_path = os.path.abspath(file_path)
+        key = (type(self), abs_path, st.st_mtime_ns, st.st_size)
+        with BaseParser._cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                cache.move_to_end(key)
+                return cached
+
+        result = self._parse_file_persistent(file_path, abs_path)
+        with BaseParser._cache_lock:
+            cache[key] = result
+            if len(cache) > self._PARSE_CACHE_MAX:
+                cache.popitem(last=False)
+        return result
+
+    def _parse_file_persistent(self, file_path: str, abs_path: str) -> ParseResult:
+        """读取文件并经由持久化缓存解析（内存缓存未命中时调用）"""
+        # 局部导入避免与 ast_cache 模块循环依赖
+        from .ast_cache import get_default_cache
+
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return self._do_parse_file(file_path)
+
+        digest = hashlib.sha256(data).digest()
+        persistent = get_default_cache()
+        result = persistent.get(abs_path, digest)
+        if result is None:
+            # 走子类的原始路径，保留其读取/解码的错误处理
+            result = self._do_parse_file(file_path)
+            persistent.put(abs_path, digest, result)
+        return result
+
+    @abstractmethod
+    def _do_parse_file(self, file_path: str) -> ParseResult:
+        """
+        实际执行文件解析（子类实现，勿直接调用）
 
         Args:
             file_path: 文件路径
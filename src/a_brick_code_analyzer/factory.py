@@ -3,20 +3,13 @@
 根据文件类型自动选择合适的解析器
 """
 
-from pathlib import Path
+import threading
+from functools import lru_cache
 from typing import Optional
 
 from .base import BaseParser
 from .python_parser import PythonParser
 
-# 可选的 JavaScript/TypeScript 支持
-try:
-    from .javascript_parser import JavaScriptParser, TypeScriptParser
-    JAVASCRIPT_SUPPORT = True
-except ImportError:
-    JAVASCRIPT_SUPPORT = False
-
-
 class ParserFactory:
     """解析器工厂类"""
 
@@ -30,18 +23,46 @@ class ParserFactory:
         '.py': 'python',
     }
 
-    # 动态注册 JavaScript/TypeScript 解析器（如果可用）
-    if JAVASCRIPT_SUPPORT:
-        _parsers.update({
-            'javascript': JavaScriptParser,
-            'typescript': TypeScriptParser,
-        })
-        _extension_map.update({
-            '.js': 'javascript',
-            '.jsx': 'javascript',
-            '.ts': 'typescript',
-            '.tsx': 'typescript',
-        })
+    # 是否已探测过 JavaScript/TypeScript 支持
+    _js_probe_done = False
+
+    # 支持的语言/扩展名缓存（注册新解析器时失效）
+    _supported_langs = None
+    _supported_exts = None
+
+    # 按线程复用的解析器实例缓存（解析器有每次解析的内部状态，
+    # tree-sitter 的 Parser 也不支持跨线程并发，故不做全局共享）
+    _thread_parsers = threading.local()
+
+    # 注册表版本号：注册新解析器时 +1，各线程缓存按版本失效
+    _registry_gen = 0
+
+    @classmethod
+    def _ensure_javascript_loaded(cls):
+        """
+        按需探测 JavaScript/TypeScript 支持
+
+        tree-sitter 绑定的导入开销较大，推迟到
+        第一次查询解析器/语言/扩展名时才进行
+        """
+        if cls._js_probe_done:
+            return
+        cls._js_probe_done = True
+        try:
+            from .javascript_parser import (
+                TREE_SITTER_AVAILABLE, JavaScriptParser, TypeScriptParser)
+        except ImportError:
+            return
+        if not TREE_SITTER_AVAILABLE:
+            return
+        cls.register_parser('javascript', JavaScriptParser, ['.js', '.jsx'])
+        cls.register_parser('typescript', TypeScriptParser, ['.ts', '.tsx'])
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _lang_for_ext(ext: str) -> Optional[str]:
+        """根据扩展名查找语言（带缓存，避免重复路径解析）"""
+        return ParserFactory._extension_map.get(ext)
 
     @classmethod
     def get_parser(cls, language: str) -> Optional[BaseParser]:
@@ -51,12 +72,61 @@ class ParserFactory:
         Args:
             language: 编程语言名称
 
+        同一线程内同一语言复用同一实例：
+        解析器构造要初始化 tree-sitter 的 Language/Parser 等对象，
+        批量分析上万个文件时只构造一次而不是一文件一套
+
         Returns:
             BaseParser: 解析器实例，如果不支持则返回 None
         """
-        parser_class = cls._parsers.get(language.lower())
-        if parser_class:
-            return parser_class()
+        cls._ensure_javascript_loaded()
+
+        local = cls._thread_parsers
+        cache = getattr(local, 'parsers', None)
+        if cache is None or local.gen != cls._registry_gen:
+            cache = local.parsers = {}
+            local.gen = cls._registry_gen
+
+        language = language.lower()
+        parser = cache.get(language)
+        if parser is None:
+            parser_class = cls._parsers.get(language)
+            if parser_class is None:
+                return None
+            parser = cache[language] = parser_class()
+        return parser
+
+    @classmethod
+    def language_for_extension(cls, ext: str) -> Optional[str]:
+        """
+        根据扩展名查找语言
+
+        Args:
+            ext: 文件扩展名（含点，如 '.py'）
+
+        Returns:
+            Optional[str]: 语言名称，如果不支持则返回 None
+        """
+        cls._ensure_javascript_loaded()
+        return cls._lang_for_ext(ext.lower())
+
+    @classmethod
+    def language_for_file(cls, file_path: str) -> Optional[str]:
+        """
+        根据文件路径查找语言
+
+        直接截取扩展名，不为每个文件构造 Path 对象
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            Optional[str]: 语言名称，如果不支持则返回 None
+        """
+        cls._ensure_javascript_loaded()
+        i = file_path.rfind('.')
+        if i > max(file_path.rfind('/'), file_path.rfind('\\')):
+            return cls._lang_for_ext(file_path[i:].lower())
         return None
 
     @classmethod
@@ -70,8 +140,7 @@ class ParserFactory:
         Returns:
             BaseParser: 解析器实例，如果不支持则返回 None
         """
-        ext = Path(file_path).suffix.lower()
-        language = cls._extension_map.get(ext)
+        language = cls.language_for_file(file_path)
         if language:
             return cls.get_parser(language)
         return None
@@ -89,23 +158,33 @@ class ParserFactory:
         cls._parsers[language.lower()] = parser_class
         for ext in extensions:
             cls._extension_map[ext.lower()] = language.lower()
+        cls._lang_for_ext.cache_clear()
+        cls._supported_langs = None
+        cls._supported_exts = None
+        cls._registry_gen += 1
 
     @classmethod
-    def get_supported_languages(cls) -> list:
+    def get_supported_languages(cls) -> tuple:
         """
         获取所有支持的语言
 
         Returns:
-            list: 支持的语言列表
+            tuple: 支持的语言元组（缓存，重复查询零分配）
         """
-        return list(cls._parsers.keys())
+        cls._ensure_javascript_loaded()
+        if cls._supported_langs is None:
+            cls._supported_langs = tuple(cls._parsers.keys())
+        return cls._supported_langs
 
     @classmethod
-    def get_supported_extensions(cls) -> list:
+    def get_supported_extensions(cls) -> tuple:
         """
         获取所有支持的文件扩展名
 
         Returns:
-            list: 支持的扩展名列表
+            tuple: 支持的扩展名元组（缓存，重复查询零分配）
         """
-        return list(cls._extension_map.keys())
+        cls._ensure_javascript_loaded()
+        if cls._supported_exts is None:
+            cls._supported_exts = tuple(cls._extension_map.keys())
+        return cls._supported_exts
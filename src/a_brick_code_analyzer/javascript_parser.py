@@ -3,24 +3,128 @@ JavaScript/TypeScript 代码解析器
 使用 Tree-sitter 进行解析
 """
 
+from bisect import bisect_left, bisect_right
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 import re
 
+from importlib.util import find_spec
+
 try:
     from tree_sitter import Language, Parser, Query, QueryCursor
-    import tree_sitter_javascript as tsjs
-    import tree_sitter_typescript as tst
-    TREE_SITTER_AVAILABLE = True
+    # 语言包只探测可用性（find_spec 不执行模块），导入推迟到首次构建 Language
+    TREE_SITTER_AVAILABLE = (
+        find_spec("tree_sitter_javascript") is not None
+        and find_spec("tree_sitter_typescript") is not None)
 except ImportError:
     TREE_SITTER_AVAILABLE = False
 
-from .base import BaseParser, ParseResult, CodeNode, NodeType
+from .base import BaseParser, ParseResult, CodeNode, NodeType, Edit
+
+
+# 模块级共享的 Language 对象：Language() 要初始化语法元数据表，
+# 每个解析器实例重建一份是纯浪费，全部实例共享同一对象
+_JS_LANG = None
+_TS_LANG = None
+
+
+def _get_js_lang():
+    """获取（必要时导入语言包并构建）JavaScript 的 Language 对象"""
+    global _JS_LANG
+    if _JS_LANG is None:
+        import tree_sitter_javascript as tsjs
+        _JS_LANG = Language(tsjs.language())
+    return _JS_LANG
+
+
+def _get_ts_lang():
+    """获取（必要时导入语言包并构建）TypeScript 的 Language 对象"""
+    global _TS_LANG
+    if _TS_LANG is None:
+        import tree_sitter_typescript as tst
+        _TS_LANG = Language(tst.language_typescript())
+    return _TS_LANG
+
+
+# 已编译查询缓存：id(Language) -> (Language, import 查询, require 查询)
+# Query 编译需要重新分析语法，开销远大于 QueryCursor 的创建，
+# 同一 Language 只编译一次（保留 Language 强引用防止 id 复用）
+_QUERY_CACHE = {}
+
+
+def _get_import_queries(language):
+    """获取（必要时编译并缓存）导入提取用的查询"""
+    key = id(language)
+    cached = _QUERY_CACHE.get(key)
+    if cached is None or cached[0] is not language:
+        import_query = Query(language, """
+        (import_statement) @import
+        """)
+        require_query = Query(language, """
+        (call_expression
+          function: (identifier) @func
+          arguments: (arguments (string))
+          (#eq? @func "require")
+        )
+        """)
+        cached = (language, import_query, require_query)
+        _QUERY_CACHE[key] = cached
+    return cached[1], cached[2]
+
+
+# 节点提取查询缓存：id(Language) -> (Language, Query)
+_NODE_QUERY_CACHE = {}
+
+# 单个查询同时捕获结构节点和控制流节点，
+# 一次 C 层遍历替代逐节点的 Python 递归
+_NODE_QUERY_SRC = """
+(function_declaration) @func
+(method_definition) @method
+(class_declaration) @class
+(variable_declarator) @var
+(if_statement) @cf
+(for_statement) @cf
+(while_statement) @cf
+(do_statement) @cf
+(switch_statement) @cf
+(catch_clause) @cf
+(ternary_expression) @cf
+"""
+
+
+_JS_BLANK_LINE_RE = re.compile(rb'(?m)^[ \t\r\f\v]*$')
+
+# 注释节点查询缓存：id(Language) -> (Language, Query)
+_COMMENT_QUERY_CACHE = {}
+
+
+def _get_comment_query(language):
+    """获取（必要时编译并缓存）注释节点查询"""
+    key = id(language)
+    cached = _COMMENT_QUERY_CACHE.get(key)
+    if cached is None or cached[0] is not language:
+        cached = (language, Query(language, "(comment) @c"))
+        _COMMENT_QUERY_CACHE[key] = cached
+    return cached[1]
+
+
+def _get_node_query(language):
+    """获取（必要时编译并缓存）节点提取查询"""
+    key = id(language)
+    cached = _NODE_QUERY_CACHE.get(key)
+    if cached is None or cached[0] is not language:
+        cached = (language, Query(language, _NODE_QUERY_SRC))
+        _NODE_QUERY_CACHE[key] = cached
+    return cached[1]
 
 
 class JavaScriptParser(BaseParser):
     """JavaScript 代码解析器"""
 
+    # 语言标识（ParseResult.language / 错误消息前缀）
+    language_name = "javascript"
+    display_name = "JavaScript"
+
     def __init__(self):
         if not TREE_SITTER_AVAILABLE:
             raise ImportError(
@@ -29,10 +133,11 @@ class JavaScriptParser(BaseParser):
             )
 
         self.supported_extensions = ['.js', '.jsx']
-        self.js_language = Language(tsjs.language())
+        self.js_language = _get_js_lang()
         self.parser = Parser(self.js_language)
+        self._init_symbol_tables()
 
-    def parse(self, code: str, file_path: str = "") -> ParseResult:
+    def _do_parse(self, code: str, file_path: str = "") -> ParseResult:
         """
         解析 JavaScript 代码
 
@@ -43,48 +148,109 @@ class JavaScriptParser(BaseParser):
         Returns:
             ParseResult: 解析结果
         """
-        try:
-            # 解析代码
-            tree = self.parser.parse(bytes(code, "utf8"))
-            root_node = tree.root_node
+        # 一次性编码为 UTF-8，解析与后续切片共用同一缓冲
+        return self.parse_bytes(code.encode('utf-8'), file_path)
+
+    def parse_bytes(self, data: bytes, file_path: str = "") -> ParseResult:
+        """
+        解析字节串形式的源代码
+
+        tree-sitter 直接消费字节缓冲，节点偏移也是字节偏移，
+        全程以 bytes 切片，仅在写入 CodeNode 时才解码
 
-            # 检查是否有语法错误
-            errors = []
-            if root_node.has_error:
-                errors.append("JavaScript syntax error detected")
+        Args:
+            data: 源代码字节串（UTF-8）
+            file_path: 文件路径（可选）
 
-            # 初始化结果
-            nodes = []
-            imports = []
+        Returns:
+            ParseResult: 解析结果
+        """
+        # parser.parse 对语法错误不抛异常，
+        # 错误通过 root_node.has_error 反映在 ParseResult.errors
+        tree = self.parser.parse(data)
+        return self._build_result(tree, data, file_path)
+
+    def parse_incremental(
+        self,
+        prev: ParseResult,
+        new_code: str,
+        edits: List[Edit]
+    ) -> ParseResult:
+        """
+        增量重解析
 
-            # 提取导入语句
-            imports = self._extract_imports(root_node, code)
+        复用上次解析保留的 tree-sitter 语法树：
+        先通过 tree.edit 标记编辑区域，再以旧树为基准解析，
+        未受影响的子树直接复用
 
-            # 遍历 AST 提取节点信息
-            self._traverse_ast(root_node, code, nodes)
+        Args:
+            prev: 上次的解析结果
+            new_code: 编辑后的完整源代码
+            edits: 自上次解析以来的编辑列表
 
-            # 计算行数统计
-            total_lines, code_lines, comment_lines, blank_lines = self._count_lines(code)
+        Returns:
+            ParseResult: 解析结果
+        """
+        old_tree = prev._tree
+        if old_tree is None or not edits:
+            return self.parse(new_code, prev.file_path)
 
-            return ParseResult(
-                file_path=file_path,
-                language="javascript",
-                nodes=nodes,
-                imports=imports,
-                total_lines=total_lines,
-                code_lines=code_lines,
-                comment_lines=comment_lines,
-                blank_lines=blank_lines,
-                errors=errors
-            )
+        try:
+            for edit in edits:
+                old_tree.edit(
+                    start_byte=edit.start_byte,
+                    old_end_byte=edit.old_end_byte,
+                    new_end_byte=edit.new_end_byte,
+                    start_point=edit.start_point,
+                    old_end_point=edit.old_end_point,
+                    new_end_point=edit.new_end_point,
+                )
+            new_bytes = new_code.encode('utf-8')
+            tree = self.parser.parse(new_bytes, old_tree)
+            return self._build_result(tree, new_bytes, prev.file_path)
         except Exception as e:
             return ParseResult(
-                file_path=file_path,
-                language="javascript",
-                errors=[f"JavaScript parsing error: {str(e)}"]
+                file_path=prev.file_path,
+                language=self.language_name,
+                errors=[f"{self.display_name} parsing error: {str(e)}"]
             )
 
-    def parse_file(self, file_path: str) -> ParseResult:
+    def _build_result(self, tree, code: bytes, file_path: str) -> ParseResult:
+        """从语法树构建 ParseResult（code 为 UTF-8 字节缓冲）"""
+        root_node = tree.root_node
+
+        # 检查是否有语法错误
+        errors = []
+        if root_node.has_error:
+            errors.append(f"{self.display_name} syntax error detected")
+
+        # 提取导入语句
+        imports = self._extract_imports(root_node, code)
+
+        # 单次查询提取节点信息
+        nodes = []
+        self._collect_nodes(root_node, code, nodes)
+
+        # 计算行数统计
+        total_lines, code_lines, comment_lines, blank_lines = \
+            self._count_lines(code, root_node)
+
+        result = ParseResult(
+            file_path=file_path,
+            language=self.language_name,
+            nodes=nodes,
+            imports=imports,
+            total_lines=total_lines,
+            code_lines=code_lines,
+            comment_lines=comment_lines,
+            blank_lines=blank_lines,
+            errors=errors
+        )
+        # 保留语法树供 parse_incremental 复用
+        result._tree = tree
+        return result
+
+    def _do_parse_file(self, file_path: str) -> ParseResult:
         """
         解析 JavaScript 文件
 
@@ -95,15 +261,16 @@ class JavaScriptParser(BaseParser):
             ParseResult: 解析结果
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            return self.parse(code, file_path)
-        except Exception as e:
+            # 以二进制读取，字节缓冲不经解码直接交给 parse_bytes
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
             return ParseResult(
                 file_path=file_path,
-                language="javascript",
+                language=self.language_name,
                 errors=[f"File reading error: {str(e)}"]
             )
+        return self.parse_bytes(data, file_path)
 
     def get_supported_extensions(self) -> List[str]:
         """
@@ -114,86 +281,67 @@ class JavaScriptParser(BaseParser):
         """
         return self.supported_extensions
 
-    def _extract_imports(self, root_node, code: str) -> List[str]:
+    def _extract_imports(self, root_node, code: bytes) -> List[str]:
         """提取导入语句"""
         imports = []
 
         # 确定使用的语言（JavaScript 或 TypeScript）
         language = getattr(self, 'ts_language', self.js_language)
 
-        # 查找 import 语句 - 使用 Query 构造函数和 QueryCursor
-        try:
-            import_query = Query(language, """
-            (import_statement) @import
-            """)
-
-            query_cursor = QueryCursor(import_query)
-            captures_dict = query_cursor.captures(root_node)
-
-            # captures_dict 是一个字典，键是捕获名，值是节点列表
-            for capture_name, nodes in captures_dict.items():
-                for node in nodes:
-                    if node.type == 'import_statement':
-                        import_text = code[node.start_byte:node.end_byte]
-                        imports.append(import_text.strip())
-        except Exception as e:
-            # 如果查询失败，记录错误但继续执行
-            pass
+        # 查询按 Language 缓存（模式固定且合法，编译不会失败），
+        # captures 对合法查询不抛异常，无需异常兜底
+        import_query, require_query = _get_import_queries(language)
 
-        # 查找 require 语句 - 使用 Query 构造函数和 QueryCursor
-        try:
-            require_query = Query(language, """
-            (call_expression
-              function: (identifier) @func
-              arguments: (arguments (string))
-            )
-            """)
-
-            query_cursor = QueryCursor(require_query)
-            captures_dict = query_cursor.captures(root_node)
-
-            # 检查是否有 func 捕获
-            if 'func' in captures_dict:
-                for node in captures_dict['func']:
-                    func_name = code[node.start_byte:node.end_byte]
-                    if func_name == 'require':
-                        # 找到对应的 require 调用
-                        require_call = node.parent
-                        if require_call and require_call.type == 'call_expression':
-                            require_text = code[require_call.start_byte:require_call.end_byte]
-                            imports.append(require_text.strip())
-        except Exception as e:
-            # 如果查询失败，记录错误但继续执行
-            pass
+        # 查找 import 语句：查询模式保证捕获到的都是 import_statement
+        captures_dict = QueryCursor(import_query).captures(root_node)
+        for node in captures_dict.get('import', []):
+            import_text = code[node.start_byte:node.end_byte]
+            imports.append(import_text.decode('utf-8').strip())
+
+        # 查找 require 语句（#eq? 谓词在查询引擎内完成名称比较）
+        captures_dict = QueryCursor(require_query).captures(root_node)
+        for node in captures_dict.get('func', []):
+            require_call = node.parent
+            if require_call is not None:
+                require_text = code[require_call.start_byte:require_call.end_byte]
+                imports.append(require_text.decode('utf-8').strip())
 
         return imports
 
-    def _traverse_ast(self, node, code: str, nodes: List[CodeNode]):
-        """遍历 AST 提取节点信息"""
-        if node.type == 'function_declaration':
-            self._handle_function_declaration(node, code, nodes)
-        elif node.type == 'method_definition':
-            self._handle_method_definition(node, code, nodes)
-        elif node.type == 'class_declaration':
-            self._handle_class_declaration(node, code, nodes)
-        elif node.type == 'variable_declarator':
-            self._handle_variable_declarator(node, code, nodes)
-
-        # 递归处理子节点
-        for child in node.children:
-            self._traverse_ast(child, code, nodes)
-
-    def _handle_function_declaration(self, node, code: str, nodes: List[CodeNode]):
+    def _collect_nodes(self, root_node, code: bytes, nodes: List[CodeNode]):
+        """
+        单次查询提取节点信息
+
+        结构节点和控制流节点由同一个已编译查询在 C 层一次捕获；
+        复杂度计算基于控制流节点的起始偏移做二分统计，
+        不再对每个函数做递归子树扫描
+        """
+        language = getattr(self, 'ts_language', self.js_language)
+        query = _get_node_query(language)
+        captures = QueryCursor(query).captures(root_node)
+
+        # 控制流节点起始偏移（有序），供 _calculate_complexity 二分
+        self._cf_starts = sorted(n.start_byte for n in captures.get('cf', []))
+        # 本次解析内按 node.id 记忆化复杂度（id 在单次解析内稳定）
+        self._complexity_by_id = {}
+
+        entries = []
+        for capture_name, handler in self._CAPTURE_HANDLERS:
+            for node in captures.get(capture_name, []):
+                entries.append((node.start_byte, node, handler))
+
+        # 按源码顺序产出节点
+        entries.sort(key=lambda entry: entry[0])
+        for _, node, handler in entries:
+            handler(self, node, code, nodes)
+
+    def _handle_function_declaration(self, node, code: bytes, nodes: List[CodeNode]):
         """处理函数声明"""
-        # 获取函数名
-        name_node = None
-        for child in node.children:
-            if child.type == 'identifier':
-                name_node = child
-                break
+        # 获取函数名（游标遍历，不物化 children 列表）
+        name_node = self._find_child(node, self._fn_name_symbols)
 
         if name_node:
-            name = code[name_node.start_byte:name_node.end_byte]
+            name = code[name_node.start_byte:name_node.end_byte].decode('utf-8')
             line_start = name_node.start_point[0] + 1
             line_end = node.end_point[0] + 1
 
@@ -212,17 +360,13 @@ class JavaScriptParser(BaseParser):
                 params=params
             ))
 
-    def _handle_method_definition(self, node, code: str, nodes: List[CodeNode]):
+    def _handle_method_definition(self, node, code: bytes, nodes: List[CodeNode]):
         """处理方法定义"""
-        # 获取方法名
-        name_node = None
-        for child in node.children:
-            if child.type in ['property_identifier', 'identifier', 'string']:
-                name_node = child
-                break
+        # 获取方法名（游标遍历，不物化 children 列表）
+        name_node = self._find_child(node, self._method_name_symbols)
 
         if name_node:
-            name = code[name_node.start_byte:name_node.end_byte]
+            name = code[name_node.start_byte:name_node.end_byte].decode('utf-8')
             line_start = name_node.start_point[0] + 1
             line_end = node.end_point[0] + 1
 
@@ -241,17 +385,13 @@ class JavaScriptParser(BaseParser):
                 params=params
             ))
 
-    def _handle_class_declaration(self, node, code: str, nodes: List[CodeNode]):
+    def _handle_class_declaration(self, node, code: bytes, nodes: List[CodeNode]):
         """处理类声明"""
-        # 获取类名
-        name_node = None
-        for child in node.children:
-            if child.type in ['identifier', 'type_identifier']:
-                name_node = child
-                break
+        # 获取类名（游标遍历，不物化 children 列表）
+        name_node = self._find_child(node, self._class_name_symbols)
 
         if name_node:
-            name = code[name_node.start_byte:name_node.end_byte]
+            name = code[name_node.start_byte:name_node.end_byte].decode('utf-8')
             line_start = name_node.start_point[0] + 1
             line_end = node.end_point[0] + 1
 
@@ -262,12 +402,12 @@ class JavaScriptParser(BaseParser):
                 line_end=line_end
             ))
 
-    def _handle_variable_declarator(self, node, code: str, nodes: List[CodeNode]):
+    def _handle_variable_declarator(self, node, code: bytes, nodes: List[CodeNode]):
         """处理变量声明"""
         # 获取变量名
         name_node = node.child_by_field_name('name')
         if name_node:
-            name = code[name_node.start_byte:name_node.end_byte]
+            name = code[name_node.start_byte:name_node.end_byte].decode('utf-8')
             line_start = name_node.start_point[0] + 1
             line_end = name_node.end_point[0] + 1
 
@@ -278,93 +418,144 @@ class JavaScriptParser(BaseParser):
                 line_end=line_end
             ))
 
-    def _extract_function_params(self, node, code: str) -> List[str]:
-        """提取函数参数"""
+    def _init_symbol_tables(self):
+        """
+        预计算节点类型的整数 id 表
+
+        子节点匹配用 kind_id 的整数比较替代字符串比较；
+        语法中不存在的类型（如 JS 中的 required_parameter）得到 None，
+        自然匹配不到任何节点
+        """
+        language = getattr(self, 'ts_language', self.js_language)
+
+        def ids(*kinds):
+            return frozenset(
+                i for i in (language.id_for_node_kind(k, True) for k in kinds)
+                if i is not None)
+
+        self._fn_name_symbols = ids('identifier')
+        self._method_name_symbols = ids('property_identifier', 'identifier', 'string')
+        self._class_name_symbols = ids('identifier', 'type_identifier')
+        self._sym_identifier = language.id_for_node_kind('identifier', True)
+        self._sym_assignment_pattern = language.id_for_node_kind(
+            'assignment_pattern', True)
+        self._sym_required_parameter = language.id_for_node_kind(
+            'required_parameter', True)
+
+    # 捕获名 -> 处理方法的类级跳转表（构建一次，_collect_nodes 查表分发）
+    _CAPTURE_HANDLERS = (
+        ('func', _handle_function_declaration),
+        ('method', _handle_method_definition),
+        ('class', _handle_class_declaration),
+        ('var', _handle_variable_declarator),
+    )
+
+    @staticmethod
+    def _find_child(node, symbols):
+        """游标遍历直接子节点，返回首个 kind_id 匹配的节点（未命中返回 None）"""
+        cursor = node.walk()
+        if not cursor.goto_first_child():
+            return None
+        while True:
+            if cursor.node.kind_id in symbols:
+                return cursor.node
+            if not cursor.goto_next_sibling():
+                return None
+
+    def _extract_function_params(self, node, code: bytes) -> List[str]:
+        """提取函数参数（单游标遍历参数列表，原地下潜复合参数）"""
         params = []
         parameters_node = node.child_by_field_name('parameters')
-        if parameters_node:
-            # 遍历参数列表
-            for child in parameters_node.children:
-                if child.type == 'identifier':
-                    # JavaScript 参数
-                    param_name = code[child.start_byte:child.end_byte]
-                    params.append(param_name)
-                elif child.type == 'assignment_pattern':
-                    # 处理默认参数 (JavaScript)
-                    left = child.child_by_field_name('left')
-                    if left and left.type == 'identifier':
-                        param_name = code[left.start_byte:left.end_byte]
-                        params.append(param_name)
-                elif child.type == 'required_parameter':
-                    # TypeScript 参数
-                    # 在 required_parameter 中查找 identifier
-                    for param_child in child.children:
-                        if param_child.type == 'identifier':
-                            param_name = code[param_child.start_byte:param_child.end_byte]
-                            params.append(param_name)
+        if not parameters_node:
+            return params
+
+        cursor = parameters_node.walk()
+        if not cursor.goto_first_child():
+            return params
+        while True:
+            child_kind = cursor.node.kind_id
+            if child_kind == self._sym_identifier:
+                # JavaScript 参数
+                child = cursor.node
+                params.append(
+                    code[child.start_byte:child.end_byte].decode('utf-8'))
+            elif child_kind == self._sym_assignment_pattern:
+                # 处理默认参数 (JavaScript)
+                left = cursor.node.child_by_field_name('left')
+                if left and left.kind_id == self._sym_identifier:
+                    params.append(
+                        code[left.start_byte:left.end_byte].decode('utf-8'))
+            elif child_kind == self._sym_required_parameter:
+                # TypeScript 参数：原地下潜查找 identifier 后回到同级
+                if cursor.goto_first_child():
+                    while True:
+                        if cursor.node.kind_id == self._sym_identifier:
+                            child = cursor.node
+                            params.append(
+                                code[child.start_byte:child.end_byte].decode('utf-8'))
+                            break
+                        if not cursor.goto_next_sibling():
                             break
+                    cursor.goto_parent()
+            if not cursor.goto_next_sibling():
+                break
         return params
 
-    def _calculate_complexity(self, node, code: str) -> int:
-        """计算圈复杂度（简化版）"""
-        complexity = 1  # 基础复杂度
-
-        # 查找控制流语句
-        control_flow_types = [
-            'if_statement', 'for_statement', 'while_statement', 'do_statement',
-            'switch_statement', 'catch_clause', 'conditional_expression'
-        ]
-
-        def count_control_flow(n):
-            nonlocal complexity
-            if n.type in control_flow_types:
-                complexity += 1
-            for child in n.children:
-                count_control_flow(child)
+    def _calculate_complexity(self, node, code: bytes) -> int:
+        """
+        计算圈复杂度（简化版）
 
-        count_control_flow(node)
+        统计落在节点字节范围内的控制流节点数：
+        对 _collect_nodes 预排序的起始偏移做两次二分，
+        结果按 node.id 记忆化，同一节点只算一次
+        """
+        memo = self._complexity_by_id
+        complexity = memo.get(node.id)
+        if complexity is None:
+            cf_starts = self._cf_starts
+            lo = bisect_left(cf_starts, node.start_byte)
+            hi = bisect_right(cf_starts, node.end_byte)
+            complexity = 1 + (hi - lo)
+            memo[node.id] = complexity
         return complexity
 
-    def _count_lines(self, code: str):
-        """计算行数统计"""
-        lines = code.split('\n')
-        total_lines = len(lines)
-        code_lines = 0
-        comment_lines = 0
-        blank_lines = 0
-
-        in_block_comment = False
-
-        for line in lines:
-            stripped = line.strip()
+    def _count_lines(self, code: bytes, root_node):
+        """
+        计算行数统计
 
-            # 检查块注释开始/结束
-            if '/*' in stripped:
-                in_block_comment = True
-                comment_lines += 1
-                continue
-            if '*/' in stripped:
-                in_block_comment = False
-                comment_lines += 1
-                continue
+        注释行取自语法树的 comment 节点捕获：解析器已在 C 层识别注释，
+        字符串字面量里的 /* 或同一行多段注释不会再被误判；
+        空白行用单次正则扫描，与注释重叠的行按注释计
+        """
+        total_lines = code.count(b'\n') + 1
 
-            if in_block_comment:
-                comment_lines += 1
-                continue
+        comment_rows = set()
+        query = _get_comment_query(getattr(self, 'ts_language', self.js_language))
+        captures = QueryCursor(query).captures(root_node)
+        for node in captures.get('c', []):
+            comment_rows.update(range(node.start_point[0], node.end_point[0] + 1))
 
-            if not stripped:
+        blank_lines = 0
+        pos = 0
+        row = 0
+        for match in _JS_BLANK_LINE_RE.finditer(code):
+            # 行号增量来自两个匹配之间的换行数（C 层计数）
+            row += code.count(b'\n', pos, match.start())
+            pos = match.start()
+            if row not in comment_rows:
                 blank_lines += 1
-            elif stripped.startswith('//'):
-                comment_lines += 1
-            else:
-                code_lines += 1
 
+        comment_lines = len(comment_rows)
+        code_lines = total_lines - comment_lines - blank_lines
         return total_lines, code_lines, comment_lines, blank_lines
 
 
 class TypeScriptParser(JavaScriptParser):
     """TypeScript 代码解析器"""
 
+    language_name = "typescript"
+    display_name = "TypeScript"
+
     def __init__(self):
         if not TREE_SITTER_AVAILABLE:
             raise ImportError(
@@ -373,88 +564,7 @@ class TypeScriptParser(JavaScriptParser):
             )
 
         self.supported_extensions = ['.ts', '.tsx']
-        self.ts_language = Language(tst.language_typescript())
+        self.ts_language = _get_ts_lang()
         self.js_language = self.ts_language  # 兼容父类方法
         self.parser = Parser(self.ts_language)
-
-    def parse(self, code: str, file_path: str = "") -> ParseResult:
-        """
-        解析 TypeScript 代码
-
-        Args:
-            code: 源代码字符串
-            file_path: 文件路径（可选）
-
-        Returns:
-            ParseResult: 解析结果
-        """
-        try:
-            # 解析代码
-            tree = self.parser.parse(bytes(code, "utf8"))
-            root_node = tree.root_node
-
-            # 检查是否有语法错误
-            errors = []
-            if root_node.has_error:
-                errors.append("TypeScript syntax error detected")
-
-            # 初始化结果
-            nodes = []
-            imports = []
-
-            # 提取导入语句
-            imports = self._extract_imports(root_node, code)
-
-            # 遍历 AST 提取节点信息
-            self._traverse_ast(root_node, code, nodes)
-
-            # 计算行数统计
-            total_lines, code_lines, comment_lines, blank_lines = self._count_lines(code)
-
-            return ParseResult(
-                file_path=file_path,
-                language="typescript",
-                nodes=nodes,
-                imports=imports,
-                total_lines=total_lines,
-                code_lines=code_lines,
-                comment_lines=comment_lines,
-                blank_lines=blank_lines,
-                errors=errors
-            )
-        except Exception as e:
-            return ParseResult(
-                file_path=file_path,
-                language="typescript",
-                errors=[f"TypeScript parsing error: {str(e)}"]
-            )
-
-    def parse_file(self, file_path: str) -> ParseResult:
-        """
-        解析 TypeScript 文件
-
-        Args:
-            file_path: 文件路径
-
-        Returns:
-            ParseResult: 解析结果
-        """
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            return self.parse(code, file_path)
-        except Exception as e:
-            return ParseResult(
-                file_path=file_path,
-                language="typescript",
-                errors=[f"File reading error: {str(e)}"]
-            )
-
-    def get_supported_extensions(self) -> List[str]:
-        """
-        获取支持的文件扩展名
-
-        Returns:
-            List[str]: 扩展名列表
-        """
-        return self.supported_extensions
\ No newline at end of file
+        self._init_symbol_tables()
\ No newline at end of file
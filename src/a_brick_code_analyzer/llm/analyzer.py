@@ -3,11 +3,14 @@ LLM 代码分析器
 结合 AST 解析结果和 LLM 进行智能代码分析
 """
 
-from typing import Optional, List, Union
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, List, Union
 from pathlib import Path
 
 from .base import LLMConfig, LLMResponse
-from .ollama_client import OllamaClient, RECOMMENDED_MODELS
+from .ollama_client import OllamaClient, RECOMMENDED_MODELS, get_shared_client
 from .prompts import PromptBuilder, AnalysisType
 
 from ..base import ParseResult, CodeNode, NodeType
@@ -15,6 +18,57 @@ from ..factory import ParserFactory
 from ..rules import RuleEngine, LintResult
 
 
+# Prompt 行模板：% 格式化是单次 C 调用，
+# 比逐段 FORMAT_VALUE 的 f-string 更适合按节点数放大的热循环
+_FUNC_TMPL = "- `%s(%s)`%s (行 %d-%d)"
+_CLASS_TMPL = "- `%s` (行 %d-%d)"
+_METHOD_TMPL = "- `%s`%s"
+_COMPLEXITY_TAG_TMPL = " [复杂度: %d]"
+_VIOLATION_TMPL = "- [%s] 行 %s: %s (%s)"
+_COMPLEXITY_TMPL = "- `%s`: 复杂度 %d (行 %d-%d)"
+
+
+# 进程池工作进程内的解析/检查状态（由 _init_analysis_worker 构建）
+_worker_state = None
+
+
+def _init_analysis_worker(preset: str):
+    """进程池初始化器：在每个工作进程内构建解析器工厂与规则引擎"""
+    global _worker_state
+    _worker_state = (ParserFactory(), RuleEngine.from_preset(preset))
+
+
+def _worker_parse_lint(file_path: str):
+    """工作进程任务：读取、解析并规则检查单个文件"""
+    factory, engine = _worker_state
+    return _parse_and_lint(factory, engine, file_path)
+
+
+def _parse_and_lint(factory: ParserFactory, engine: RuleEngine, file_path: str):
+    """读取文件，解析并执行规则检查，返回 (源码, 解析结果, 检查结果)"""
+    try:
+        # 一次字节读取：解析器直接消费字节，str 只为 Prompt 解码一次
+        data = Path(file_path).read_bytes()
+        code = data.decode("utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        parse_result = ParseResult(
+            file_path=file_path, language="unknown", errors=[str(e)])
+        return "", parse_result, engine.lint(parse_result)
+
+    parser = factory.get_parser_by_file(file_path)
+    if parser is None:
+        parse_result = ParseResult(
+            file_path=file_path, language="unknown",
+            errors=[f"不支持的文件类型: {file_path}"])
+    else:
+        parse_result = parser.parse_bytes(data, file_path)
+
+    lint_result = engine.lint(parse_result)
+    # 语法树持有 C 指针，无法跨进程序列化
+    parse_result._tree = None
+    return code, parse_result, lint_result
+
+
 class CodeAnalyzer:
     """
     LLM 代码分析器
@@ -39,12 +93,14 @@ class CodeAnalyzer:
         if client:
             self.client = client
         else:
-            self.client = OllamaClient(config=config, model=model)
+            # 相同服务与模型的分析器共享客户端（见 get_shared_client）
+            self.client = get_shared_client(config=config, model=model)
 
         self.prompt_builder = PromptBuilder()
         self.parser_factory = ParserFactory()
-        self.rule_engine = RuleEngine()
-        self.rule_engine.use_preset("recommended")
+        # 与 analyze_paths 的工作进程引擎（_init_analysis_worker）同构：
+        # from_preset 先注册内置规则再应用预设，串行与并行路径检查结果一致
+        self.rule_engine = RuleEngine.from_preset("recommended")
 
     def set_model(self, model: str) -> None:
         """切换模型"""
@@ -66,22 +122,24 @@ class CodeAnalyzer:
         if functions:
             lines.append(f"### 函数 ({len(functions)} 个)")
             for func in functions:
-                complexity_tag = f" [复杂度: {func.complexity}]" if func.complexity > 0 else ""
+                complexity_tag = _COMPLEXITY_TAG_TMPL % func.complexity if func.complexity > 0 else ""
                 params = ", ".join(func.params) if func.params else ""
-                lines.append(f"- `{func.name}({params})`{complexity_tag} (行 {func.line_start}-{func.line_end})")
+                lines.append(_FUNC_TMPL % (
+                    func.name, params, complexity_tag,
+                    func.line_start, func.line_end))
 
         classes = parse_result.get_classes()
         if classes:
             lines.append(f"\n### 类 ({len(classes)} 个)")
             for cls in classes:
-                lines.append(f"- `{cls.name}` (行 {cls.line_start}-{cls.line_end})")
+                lines.append(_CLASS_TMPL % (cls.name, cls.line_start, cls.line_end))
 
         methods = parse_result.get_methods()
         if methods:
             lines.append(f"\n### 方法 ({len(methods)} 个)")
             for method in methods:
-                complexity_tag = f" [复杂度: {method.complexity}]" if method.complexity > 0 else ""
-                lines.append(f"- `{method.name}`{complexity_tag}")
+                complexity_tag = _COMPLEXITY_TAG_TMPL % method.complexity if method.complexity > 0 else ""
+                lines.append(_METHOD_TMPL % (method.name, complexity_tag))
 
         return "\n".join(lines) if lines else "无结构信息"
 
@@ -92,24 +150,24 @@ class CodeAnalyzer:
 
         lines = [f"共 {lint_result.total_violations} 个问题 (错误: {lint_result.error_count}, 警告: {lint_result.warning_count})"]
         for v in lint_result.violations:
-            lines.append(f"- [{v.severity.name}] 行 {v.line}: {v.message} ({v.rule_id})")
+            lines.append(_VIOLATION_TMPL % (v.severity.name, v.line, v.message, v.rule_id))
 
         return "\n".join(lines)
 
     def _format_complexity_info(self, parse_result: ParseResult, threshold: int = 5) -> str:
-        """格式化复杂度信息"""
-        high_complexity = []
-
-        for node in parse_result.nodes:
-            if node.node_type in (NodeType.FUNCTION, NodeType.METHOD) and node.complexity > threshold:
-                high_complexity.append(node)
+        """格式化复杂度信息（基于列式视图筛选排序，不逐节点访问属性）"""
+        columns = parse_result.get_columns()
+        indices = columns.indices_by_complexity(
+            (NodeType.FUNCTION, NodeType.METHOD), threshold)
 
-        if not high_complexity:
+        if not indices:
             return "无高复杂度函数"
 
         lines = []
-        for node in sorted(high_complexity, key=lambda x: x.complexity, reverse=True):
-            lines.append(f"- `{node.name}`: 复杂度 {node.complexity} (行 {node.line_start}-{node.line_end})")
+        for i in indices:
+            lines.append(_COMPLEXITY_TMPL % (
+                columns.names[i], columns.complexities[i],
+                columns.line_starts[i], columns.line_ends[i]))
 
         return "\n".join(lines)
 
@@ -132,13 +190,13 @@ class CodeAnalyzer:
         Returns:
             LLMResponse: LLM 分析结果
         """
-        # 自动检测语言
+        # 自动检测语言（公开接口按扩展名查表，不构造 Path 对象）
         if language is None:
+            language = "python"
             if file_path:
-                ext = Path(file_path).suffix
-                language = self.parser_factory._extension_map.get(ext, "python")
-            else:
-                language = "python"
+                detected = self.parser_factory.language_for_file(file_path)
+                if detected:
+                    language = detected
 
         # 解析代码
         try:
@@ -154,7 +212,19 @@ class CodeAnalyzer:
         # 规则检查
         lint_result = self.rule_engine.lint(parse_result)
 
-        # 构建 Prompt
+        return self._generate_for_parsed(
+            code, file_path, language, parse_result, lint_result, analysis_type)
+
+    def _generate_for_parsed(
+        self,
+        code: str,
+        file_path: str,
+        language: str,
+        parse_result: ParseResult,
+        lint_result: LintResult,
+        analysis_type: AnalysisType,
+    ) -> LLMResponse:
+        """基于已有的解析/检查结果构建 Prompt 并调用 LLM"""
         prompt = self.prompt_builder.build(
             analysis_type=analysis_type,
             code=code,
@@ -168,9 +238,115 @@ class CodeAnalyzer:
             imports=", ".join(parse_result.imports) if parse_result.imports else "无",
         )
 
-        # 调用 LLM
         return self.client.generate(prompt)
 
+    def analyze_paths(
+        self,
+        paths: List[Union[str, Path]],
+        analysis_type: AnalysisType = AnalysisType.CODE_REVIEW,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[int, int, str], None]] = None,
+    ) -> List[LLMResponse]:
+        """
+        批量分析多个文件
+
+        解析与规则检查是 CPU 密集型，分发到进程池并行执行
+        （每个工作进程在初始化时自建工厂与规则引擎，
+        tree-sitter 的 C 状态不跨进程传递）；
+        LLM 调用在主进程按输入顺序串行复用共享客户端
+
+        Args:
+            paths: 文件路径列表
+            analysis_type: 分析类型
+            workers: 工作进程数，默认为 CPU 核数
+            progress: 进度回调，参数为 (已完成数, 总数, 文件路径)
+
+        Returns:
+            List[LLMResponse]: 与输入顺序对应的分析结果
+        """
+        paths = [str(p) for p in paths]
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(paths) <= 1:
+            parsed_iter = (
+                _parse_and_lint(self.parser_factory, self.rule_engine, p)
+                for p in paths)
+            return self._consume_parsed(paths, parsed_iter, analysis_type, progress)
+
+        chunksize = max(1, len(paths) // (4 * workers))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_analysis_worker,
+            initargs=("recommended",),
+        ) as executor:
+            parsed_iter = executor.map(_worker_parse_lint, paths, chunksize=chunksize)
+            return self._consume_parsed(paths, parsed_iter, analysis_type, progress)
+
+    def _consume_parsed(self, paths, parsed_iter, analysis_type, progress):
+        """消费解析结果流，逐个构建 Prompt 并调用 LLM"""
+        responses = []
+        total = len(paths)
+        for file_path, (code, parse_result, lint_result) in zip(paths, parsed_iter):
+            responses.append(self._generate_for_parsed(
+                code, file_path, parse_result.language,
+                parse_result, lint_result, analysis_type))
+            if progress is not None:
+                progress(len(responses), total, file_path)
+        return responses
+
+    def analyze_many(
+        self,
+        codes: List[str],
+        analysis_type: AnalysisType = AnalysisType.CODE_REVIEW,
+        max_workers: int = 4,
+    ) -> List[LLMResponse]:
+        """
+        并发分析多段代码
+
+        HTTP 请求阻塞在 socket I/O 时释放 GIL，
+        用线程池并发发送可以重叠多次 LLM 调用的等待时间
+
+        Args:
+            codes: 代码内容列表
+            analysis_type: 分析类型
+            max_workers: 并发线程数
+
+        Returns:
+            List[LLMResponse]: 与输入顺序对应的分析结果
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda code: self.analyze(code, analysis_type), codes))
+
+    async def analyze_many_async(
+        self,
+        codes: List[str],
+        analysis_type: AnalysisType = AnalysisType.CODE_REVIEW,
+        max_concurrency: int = 4,
+    ) -> List[LLMResponse]:
+        """
+        并发分析多段代码（异步接口）
+
+        analyze_many 的 asyncio 版本，可嵌入调用方已有的事件循环；
+        信号量限制在途请求数，避免压垮本地 Ollama 服务
+
+        Args:
+            codes: 代码内容列表
+            analysis_type: 分析类型
+            max_concurrency: 最大并发请求数
+
+        Returns:
+            List[LLMResponse]: 与输入顺序对应的分析结果
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze_one(code: str) -> LLMResponse:
+            async with semaphore:
+                return await asyncio.to_thread(self.analyze, code, analysis_type)
+
+        return list(await asyncio.gather(*(analyze_one(code) for code in codes)))
+
     def analyze_file(
         self,
         file_path: Union[str, Path],
@@ -190,12 +366,12 @@ class CodeAnalyzer:
         if not file_path.exists():
             raise FileNotFoundError(f"文件不存在: {file_path}")
 
-        code = file_path.read_text(encoding="utf-8")
-        return self.analyze(
-            code=code,
-            analysis_type=analysis_type,
-            file_path=str(file_path),
-        )
+        # 与 analyze_paths 共用字节直达的解析路径
+        code, parse_result, lint_result = _parse_and_lint(
+            self.parser_factory, self.rule_engine, str(file_path))
+        return self._generate_for_parsed(
+            code, str(file_path), parse_result.language,
+            parse_result, lint_result, analysis_type)
 
     def review(self, code: str, file_path: str = "") -> LLMResponse:
         """代码审查（快捷方法）"""
@@ -2,6 +2,7 @@
 LLM 客户端抽象基类
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
@@ -84,6 +85,65 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    async def agenerate(self, prompt: str, **kwargs) -> LLMResponse:
+        """
+        generate 的异步版本
+
+        默认实现把阻塞的 HTTP 调用委托给线程执行器，
+        多个请求的网络等待在事件循环中重叠
+
+        Args:
+            prompt: 提示词
+            **kwargs: 额外参数
+
+        Returns:
+            LLMResponse: 生成结果
+        """
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
+    async def achat(self, messages: List[Dict[str, str]], **kwargs) -> LLMResponse:
+        """
+        chat 的异步版本（同 agenerate，委托线程执行器）
+
+        Args:
+            messages: 消息列表 [{"role": "user", "content": "..."}]
+            **kwargs: 额外参数
+
+        Returns:
+            LLMResponse: 生成结果
+        """
+        return await asyncio.to_thread(self.chat, messages, **kwargs)
+
+    async def batch_generate(
+        self,
+        prompts: List[str],
+        concurrency: int = 8,
+        **kwargs
+    ) -> List[Any]:
+        """
+        并发批量生成
+
+        所有请求经 agenerate 并发发出，信号量限制在途数量；
+        单个请求失败不中断整批，对应位置返回异常对象由调用方处置
+
+        Args:
+            prompts: 提示词列表
+            concurrency: 最大并发请求数
+            **kwargs: 透传给 generate 的额外参数
+
+        Returns:
+            List[Any]: 与输入顺序对应的 LLMResponse 或异常对象
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate_one(prompt: str):
+            async with semaphore:
+                return await self.agenerate(prompt, **kwargs)
+
+        return list(await asyncio.gather(
+            *(generate_one(prompt) for prompt in prompts),
+            return_exceptions=True))
+
     @abstractmethod
     def list_models(self) -> List[ModelInfo]:
         """
@@ -3,10 +3,26 @@ Ollama 客户端实现
 """
 
 import json
+import threading
 import time
-from typing import List, Dict, Any, Optional
-from urllib.request import urlopen, Request
-from urllib.error import URLError, HTTPError
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from typing import Callable, List, Dict, Any, Optional
+from urllib.parse import urlparse
+
+# orjson 可选：序列化/解析比标准库 json 快数倍（NDJSON 流式分块逐条 loads 时最明显）
+# 两种实现的 dumps 统一返回 bytes，可直接作为请求体
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+    ORJSON_AVAILABLE = True
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    ORJSON_AVAILABLE = False
 
 from .base import (
     BaseLLMClient,
@@ -72,6 +88,16 @@ RECOMMENDED_MODELS = {
     ),
 }
 
+# 推荐模型的只读快照与交互菜单文本（模块导入时构建一次）
+_RECOMMENDED_LIST = tuple(RECOMMENDED_MODELS.values())
+_DISPLAY_LINES = tuple(
+    f"  {i}. {model.name}\n"
+    f"     {model.description}\n"
+    f"     参数量: {model.size} | 上下文: {model.context_length} | "
+    f"{'✓ 中文' if model.supports_chinese else '✗ 英文'}\n"
+    for i, model in enumerate(_RECOMMENDED_LIST, 1)
+)
+
 
 class OllamaClient(BaseLLMClient):
     """Ollama 客户端"""
@@ -96,59 +122,126 @@ class OllamaClient(BaseLLMClient):
 
         super().__init__(config)
 
-    def _request(self, endpoint: str, data: Optional[Dict] = None, method: str = "GET") -> Dict:
-        """发送 HTTP 请求"""
-        url = f"{self.config.base_url}{endpoint}"
+        # base_url 只在构造时解析一次；连接按线程持久复用，
+        # 避免每次请求重新解析 URL 和三次握手
+        parsed = urlparse(config.base_url)
+        self._conn_cls = (
+            HTTPSConnection if parsed.scheme == 'https' else HTTPConnection)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self._base_path = parsed.path.rstrip('/')
+        self._local = threading.local()
+
+        # 可用性/模型列表的短 TTL 缓存：UI 轮询时突发调用合并成一次探测
+        self._avail_cache = (0.0, False)
+        self._models_cache = (0.0, None)
+
+    def _get_conn(self):
+        """获取（必要时建立）当前线程的持久连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._conn_cls(
+                self._host, self._port, timeout=self.config.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _close_conn(self):
+        """关闭并丢弃当前线程的连接（失效后重建）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            try:
+                conn.close()
+            except OSError:
+                pass
+            self._local.conn = None
+
+    def _send(self, method: str, endpoint: str, body: Optional[bytes]):
+        """
+        在持久连接上发送请求
 
-        if data:
-            body = json.dumps(data).encode("utf-8")
-            req = Request(url, data=body, method=method)
-            req.add_header("Content-Type", "application/json")
-        else:
-            req = Request(url, method=method)
+        服务端关闭空闲连接（keep-alive 超时）时重连重试一次
+        """
+        headers = {"Content-Type": "application/json"} if body else {}
+        path = self._base_path + endpoint
+        last_error = None
+        for _ in range(2):
+            conn = self._get_conn()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                return conn.getresponse()
+            except (HTTPException, ConnectionError, OSError) as e:
+                self._close_conn()
+                last_error = e
+        raise ConnectionError(f"无法连接到 Ollama 服务: {last_error}")
 
-        try:
-            with urlopen(req, timeout=self.config.timeout) as response:
-                return json.loads(response.read().decode("utf-8"))
-        except HTTPError as e:
-            raise ConnectionError(f"HTTP 错误 {e.code}: {e.reason}")
-        except URLError as e:
-            raise ConnectionError(f"无法连接到 Ollama 服务: {e.reason}")
+    def _request(self, endpoint: str, data: Optional[Dict] = None, method: str = "GET") -> Dict:
+        """发送 HTTP 请求（复用持久连接）"""
+        body = _json_dumps(data) if data else None
+        response = self._send(method, endpoint, body)
+        # 错误响应也要读完 body，连接才能继续复用
+        payload = response.read()
+        if response.status >= 400:
+            raise ConnectionError(f"HTTP 错误 {response.status}: {response.reason}")
+        return _json_loads(payload)
 
     def _stream_request(self, endpoint: str, data: Dict) -> str:
-        """发送流式请求并收集完整响应"""
-        url = f"{self.config.base_url}{endpoint}"
-        body = json.dumps(data).encode("utf-8")
-        req = Request(url, data=body, method="POST")
-        req.add_header("Content-Type", "application/json")
-
-        full_response = ""
-        try:
-            with urlopen(req, timeout=self.config.timeout) as response:
-                for line in response:
-                    if line:
-                        chunk = json.loads(line.decode("utf-8"))
-                        if "response" in chunk:
-                            full_response += chunk["response"]
-                        elif "message" in chunk:
-                            full_response += chunk["message"].get("content", "")
-        except HTTPError as e:
-            raise ConnectionError(f"HTTP 错误 {e.code}: {e.reason}")
-        except URLError as e:
-            raise ConnectionError(f"无法连接到 Ollama 服务: {e.reason}")
-
-        return full_response
+        """发送流式请求并收集完整响应（复用持久连接）"""
+        body = _json_dumps(data)
+        response = self._send("POST", endpoint, body)
+        if response.status >= 400:
+            response.read()
+            raise ConnectionError(f"HTTP 错误 {response.status}: {response.reason}")
+
+        # 分块收集到列表后一次 join，避免逐块 += 的二次方拷贝
+        parts: List[str] = []
+        while True:
+            line = response.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            chunk = _json_loads(line)
+            if "response" in chunk:
+                parts.append(chunk["response"])
+            elif "message" in chunk:
+                parts.append(chunk["message"].get("content", ""))
+
+        return "".join(parts)
+
+    # 可用性 / 模型列表缓存的 TTL（秒）
+    _AVAIL_TTL = 2.0
+    _MODELS_TTL = 30.0
 
     def is_available(self) -> bool:
-        """检查 Ollama 服务是否可用"""
+        """检查 Ollama 服务是否可用（2 秒内的重复调用直接返回缓存）"""
+        stamp, available = self._avail_cache
+        now = time.monotonic()
+        if now - stamp < self._AVAIL_TTL:
+            return available
         try:
             self._request("/api/tags")
-            return True
+            available = True
         except Exception:
-            return False
+            available = False
+        self._avail_cache = (now, available)
+        return available
 
     def list_models(self) -> List[ModelInfo]:
-        """列出已安装的模型"""
+        """列出已安装的模型（30 秒内的重复调用直接返回缓存）"""
+        stamp, cached = self._models_cache
+        if cached is not None and time.monotonic() - stamp < self._MODELS_TTL:
+            return list(cached)
+        models = self._fetch_models()
+        self._models_cache = (time.monotonic(), models)
+        return list(models)
+
+    def refresh(self) -> None:
+        """清空可用性/模型列表缓存，下次调用重新探测"""
+        self._avail_cache = (0.0, False)
+        self._models_cache = (0.0, None)
+
+    def _fetch_models(self) -> List[ModelInfo]:
+        """从服务端拉取已安装的模型列表"""
         try:
             response = self._request("/api/tags")
             models = []
@@ -171,23 +264,49 @@ class OllamaClient(BaseLLMClient):
 
     def list_recommended_models(self) -> List[ModelInfo]:
         """列出推荐的代码分析模型"""
-        return list(RECOMMENDED_MODELS.values())
+        return list(_RECOMMENDED_LIST)
 
-    def pull_model(self, model_name: str) -> bool:
+    def pull_model(
+        self,
+        model_name: str,
+        on_progress: Optional[Callable[[Dict], None]] = None
+    ) -> bool:
         """
-        下载模型
+        下载模型（流式读取进度）
+
+        /api/pull 的响应是整个下载过程的 NDJSON 进度流，
+        逐行消费而不是整体 read()，大模型也不会把进度日志攒在内存里；
+        连接上的超时按单次读取计，下载停滞时及时失败
 
         Args:
             model_name: 模型名称
+            on_progress: 进度回调，逐条收到进度 dict（可选）
 
         Returns:
             bool: 是否成功
         """
         try:
-            # 注意：这是一个长时间操作，实际使用时应该用流式处理显示进度
-            self._request("/api/pull", {"name": model_name}, method="POST")
-            return True
+            body = _json_dumps({"name": model_name})
+            response = self._send("POST", "/api/pull", body)
+            if response.status >= 400:
+                response.read()
+                return False
+            success = False
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                chunk = _json_loads(line)
+                if on_progress is not None:
+                    on_progress(chunk)
+                if chunk.get("status") == "success":
+                    success = True
+            return success
         except Exception:
+            # 流中断后连接不可复用
+            self._close_conn()
             return False
 
     def generate(self, prompt: str, **kwargs) -> LLMResponse:
@@ -258,12 +377,46 @@ class OllamaClient(BaseLLMClient):
     def set_model(self, model: str) -> None:
         """切换模型"""
         self.config.model = model
+        self.refresh()
 
     def get_current_model(self) -> str:
         """获取当前模型"""
         return self.config.model
 
 
+# 共享客户端注册表：(base_url, model) -> 客户端实例
+_shared_clients: Dict[tuple, "OllamaClient"] = {}
+
+
+def get_shared_client(
+    config: Optional[LLMConfig] = None,
+    model: Optional[str] = None
+) -> "OllamaClient":
+    """
+    获取共享的 Ollama 客户端
+
+    相同服务地址与模型的多个分析器复用同一客户端实例
+    （及其底层连接），避免各自重新建立连接。
+    指定了自定义 config 时不共享，直接新建。
+
+    Args:
+        config: LLM 配置（提供时返回独立客户端）
+        model: 模型名称
+
+    Returns:
+        OllamaClient: 客户端实例
+    """
+    if config is not None:
+        return OllamaClient(config=config, model=model)
+
+    key = (OllamaClient.DEFAULT_BASE_URL, model or DEFAULT_MODEL)
+    client = _shared_clients.get(key)
+    if client is None:
+        client = OllamaClient(model=model)
+        _shared_clients[key] = client
+    return client
+
+
 def select_model_interactive() -> str:
     """
     交互式选择模型
@@ -274,13 +427,9 @@ def select_model_interactive() -> str:
     print("\n可用的代码分析模型：")
     print("-" * 60)
 
-    models = list(RECOMMENDED_MODELS.values())
-    for i, model in enumerate(models, 1):
-        chinese_tag = "✓ 中文" if model.supports_chinese else "✗ 英文"
-        print(f"  {i}. {model.name}")
-        print(f"     {model.description}")
-        print(f"     参数量: {model.size} | 上下文: {model.context_length} | {chinese_tag}")
-        print()
+    models = _RECOMMENDED_LIST
+    for line in _DISPLAY_LINES:
+        print(line)
 
     while True:
         try:
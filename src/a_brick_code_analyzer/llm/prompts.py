@@ -2,8 +2,9 @@
 代码分析 Prompt 模板
 """
 
-from dataclasses import dataclass
-from typing import Optional
+import string
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
 from enum import Enum
 
 
@@ -18,7 +19,32 @@ class AnalysisType(Enum):
     DOCSTRING = "docstring"
 
 
-@dataclass
+def _compile_template(template: str) -> Callable[[Dict], str]:
+    """
+    把 {name} 模板预编译成渲染闭包
+
+    str.format 每次调用都要重新解析整个模板字符串；
+    这里在构造模板时解析一次，渲染只剩字典查找 + join。
+    带格式说明/转换标记的字段走不了简单替换，整体回退到 str.format
+    """
+    segments = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion:
+            return lambda values: template.format_map(values)
+        if literal:
+            segments.append(literal)
+        if field_name is not None:
+            segments.append((field_name,))
+
+    def render(values: Dict) -> str:
+        return ''.join(
+            seg if type(seg) is str else str(values[seg[0]])
+            for seg in segments)
+
+    return render
+
+
+@dataclass(slots=True)
 class PromptTemplate:
     """Prompt 模板"""
     name: str
@@ -26,6 +52,13 @@ class PromptTemplate:
     description: str
     analysis_type: AnalysisType
 
+    # 预编译的渲染闭包（构造时生成，见 _compile_template）
+    _render: Callable[[Dict], str] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._render = _compile_template(self.template)
+
 
 # 预定义的 Prompt 模板
 PROMPTS = {
@@ -234,8 +267,8 @@ PROMPTS = {
 class PromptBuilder:
     """Prompt 构建器"""
 
-    def __init__(self):
-        self.templates = PROMPTS.copy()
+    # 类级共享内置模板；注册自定义模板时才写时复制到实例（见 register_template）
+    templates = PROMPTS
 
     def get_template(self, analysis_type: AnalysisType) -> PromptTemplate:
         """获取模板"""
@@ -275,21 +308,25 @@ class PromptBuilder:
             str: 构建好的 Prompt
         """
         template = self.templates[analysis_type]
-        return template.template.format(
-            code=code,
-            file_path=file_path or "未知",
-            language=language,
-            total_lines=total_lines,
-            code_lines=code_lines,
-            ast_summary=ast_summary or "无",
-            lint_results=lint_results or "无",
-            complexity_info=complexity_info or "无",
-            imports=imports or "无",
-            **kwargs
-        )
+        values = {
+            'code': code,
+            'file_path': file_path or "未知",
+            'language': language,
+            'total_lines': total_lines,
+            'code_lines': code_lines,
+            'ast_summary': ast_summary or "无",
+            'lint_results': lint_results or "无",
+            'complexity_info': complexity_info or "无",
+            'imports': imports or "无",
+        }
+        if kwargs:
+            values.update(kwargs)
+        return template._render(values)
 
     def register_template(self, analysis_type: AnalysisType, template: PromptTemplate) -> None:
-        """注册自定义模板"""
+        """注册自定义模板（首次注册时复制内置模板，不污染其他实例）"""
+        if 'templates' not in self.__dict__:
+            self.templates = dict(PROMPTS)
         self.templates[analysis_type] = template
 
     def list_templates(self) -> list:
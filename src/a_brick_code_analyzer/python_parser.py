@@ -8,6 +8,25 @@ from typing import List
 from pathlib import Path
 
 from .base import BaseParser, ParseResult, CodeNode, NodeType
+from ._fastcount import count_python_lines
+
+
+def _fast_docstring(node) -> str:
+    """
+    提取函数/类的原始文档字符串
+
+    等价于 ast.get_docstring 但不做 cleandoc 缩进清理：
+    大多数节点的 docstring 只用于存在性判断或原样展示，
+    省掉每个函数/类一次的函数调用和 dedent 开销
+    """
+    body = node.body
+    if body:
+        first = body[0]
+        if type(first) is ast.Expr:
+            value = first.value
+            if type(value) is ast.Constant and isinstance(value.value, str):
+                return value.value
+    return None
 
 
 class PythonParser(BaseParser):
@@ -16,7 +35,7 @@ class PythonParser(BaseParser):
     def __init__(self):
         self.supported_extensions = ['.py']
 
-    def parse(self, code: str, file_path: str = "") -> ParseResult:
+    def _do_parse(self, code: str, file_path: str = "") -> ParseResult:
         """
         解析 Python 代码
 
@@ -36,18 +55,18 @@ class PythonParser(BaseParser):
             # 解析代码为 AST
             tree = ast.parse(code)
 
-            # 统计代码行数
-            lines = code.split('\n')
-            result.total_lines = len(lines)
-            result.blank_lines = sum(1 for line in lines if not line.strip())
-            result.comment_lines = sum(1 for line in lines if line.strip().startswith('#'))
-            result.code_lines = result.total_lines - result.blank_lines - result.comment_lines
+            # 统计代码行数（单次扫描）
+            (result.total_lines, result.code_lines,
+             result.comment_lines, result.blank_lines) = count_python_lines(code)
 
-            # 提取节点信息
-            visitor = PythonASTVisitor()
+            # 以 def/class 出现次数作为节点数上界预分配
+            result.reserve(code.count('def ') + code.count('class '))
+
+            # 提取节点信息（直接写入 result）
+            visitor = PythonASTVisitor(result)
             visitor.visit(tree)
+            result.finalize_nodes()
 
-            result.nodes = visitor.nodes
             result.imports = visitor.imports
 
         except SyntaxError as e:
@@ -57,7 +76,44 @@ class PythonParser(BaseParser):
 
         return result
 
-    def parse_file(self, file_path: str) -> ParseResult:
+    def from_ast(self, tree: ast.Module, file_path: str = "") -> ParseResult:
+        """
+        直接从已构建的 AST 生成解析结果（跳过词法/语法分析）
+
+        供以编程方式构造语法树的调用方使用（节点需携带行号，
+        必要时先经 ast.fix_missing_locations）。没有源码文本可供
+        行数分类，total_lines/code_lines 取顶层节点的最大 end_lineno，
+        注释行/空行计为 0
+
+        Args:
+            tree: ast.Module 语法树
+            file_path: 文件路径（可选）
+
+        Returns:
+            ParseResult: 解析结果
+        """
+        result = ParseResult(
+            file_path=file_path,
+            language="python"
+        )
+
+        try:
+            result.total_lines = result.code_lines = max(
+                (getattr(node, 'end_lineno', 0) or 0 for node in tree.body),
+                default=0)
+
+            visitor = PythonASTVisitor(result)
+            visitor.visit(tree)
+            result.finalize_nodes()
+
+            result.imports = visitor.imports
+
+        except Exception as e:
+            result.errors.append(f"解析错误: {str(e)}")
+
+        return result
+
+    def _do_parse_file(self, file_path: str) -> ParseResult:
         """
         解析 Python 文件
 
@@ -68,9 +124,10 @@ class PythonParser(BaseParser):
             ParseResult: 解析结果
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            return self.parse(code, file_path)
+            # 以二进制读取，交给 parse_bytes 一次性解码
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            return self.parse_bytes(data, file_path)
         except FileNotFoundError:
             result = ParseResult(file_path=file_path, language="python")
             result.errors.append(f"文件不存在: {file_path}")
@@ -85,16 +142,59 @@ class PythonParser(BaseParser):
         return self.supported_extensions
 
 
-class PythonASTVisitor(ast.NodeVisitor):
-    """Python AST 访问器，用于提取代码信息"""
+class PythonASTVisitor:
+    """
+    Python AST 访问器，用于提取代码信息
 
-    def __init__(self):
-        self.nodes: List[CodeNode] = []
+    用显式栈做迭代遍历而不是继承 NodeVisitor 的递归：
+    深度嵌套的源文件不会撞上递归深度限制，也省去逐层的 Python 调用帧。
+    节点分发走类型到处理函数的预构建字典（见 _DISPATCH）
+    """
+
+    # 作用域出栈哨兵标记（压在子节点之下，子树遍历完毕时弹出）
+    _POP_FUNC = 0
+    _POP_CLASS = 1
+
+    def __init__(self, result: ParseResult):
+        self.result = result
         self.imports: List[str] = []
         self.current_class: str = None
-
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        """访问函数定义"""
+        # 复杂度在主遍历中顺带累计：分支节点为栈上所有外层函数计数，
+        # 不再对每个函数用 ast.walk 重扫整棵子树
+        self._func_stack: List[CodeNode] = []
+
+    def visit(self, tree: ast.AST):
+        """迭代遍历整棵 AST（前序，与源码顺序一致）"""
+        # 热循环中的访问全部绑定为局部变量，省掉每个节点的属性查找
+        dispatch_get = self._DISPATCH.get
+        func_stack = self._func_stack
+        iter_child_nodes = ast.iter_child_nodes
+        pop_func = self._POP_FUNC
+        stack = [tree]
+        pop = stack.pop
+        push = stack.append
+        extend = stack.extend
+        while stack:
+            item = pop()
+            if item.__class__ is tuple:
+                kind, payload = item
+                if kind == pop_func:
+                    func_stack.pop()
+                else:
+                    self.current_class = payload
+                continue
+            handler = dispatch_get(item.__class__)
+            if handler is not None:
+                sentinel = handler(self, item)
+                if sentinel is not None:
+                    push(sentinel)
+            children = list(iter_child_nodes(item))
+            if children:
+                children.reverse()
+                extend(children)
+
+    def _handle_function_def(self, node: ast.FunctionDef):
+        """处理函数定义"""
         # 判断是函数还是方法
         node_type = NodeType.METHOD if self.current_class else NodeType.FUNCTION
 
@@ -105,17 +205,14 @@ class PythonASTVisitor(ast.NodeVisitor):
         decorators = [self._get_decorator_name(dec) for dec in node.decorator_list]
 
         # 提取文档字符串
-        docstring = ast.get_docstring(node)
-
-        # 计算圈复杂度
-        complexity = self._calculate_complexity(node)
+        docstring = _fast_docstring(node)
 
         code_node = CodeNode(
             node_type=node_type,
             name=node.name,
             line_start=node.lineno,
             line_end=node.end_lineno or node.lineno,
-            complexity=complexity,
+            complexity=1,  # 基础复杂度，分支点由 _bump_complexity 累加
             params=params,
             decorators=decorators,
             docstring=docstring,
@@ -125,20 +222,17 @@ class PythonASTVisitor(ast.NodeVisitor):
             }
         )
 
-        self.nodes.append(code_node)
-        self.generic_visit(node)
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        """访问异步函数定义"""
-        self.visit_FunctionDef(node)
+        self.result.add_node(code_node)
+        self._func_stack.append(code_node)
+        return (self._POP_FUNC, None)
 
-    def visit_ClassDef(self, node: ast.ClassDef):
-        """访问类定义"""
+    def _handle_class_def(self, node: ast.ClassDef):
+        """处理类定义"""
         # 提取装饰器
         decorators = [self._get_decorator_name(dec) for dec in node.decorator_list]
 
         # 提取文档字符串
-        docstring = ast.get_docstring(node)
+        docstring = _fast_docstring(node)
 
         # 提取基类
         bases = [self._get_name(base) for base in node.bases]
@@ -155,27 +249,53 @@ class PythonASTVisitor(ast.NodeVisitor):
             }
         )
 
-        self.nodes.append(code_node)
+        self.result.add_node(code_node)
 
-        # 进入类作用域
-        old_class = self.current_class
+        # 进入类作用域，哨兵在子树遍历完后恢复外层类名
+        sentinel = (self._POP_CLASS, self.current_class)
         self.current_class = node.name
-        self.generic_visit(node)
-        self.current_class = old_class
+        return sentinel
 
-    def visit_Import(self, node: ast.Import):
-        """访问 import 语句"""
+    def _handle_import(self, node: ast.Import):
+        """处理 import 语句"""
         for alias in node.names:
             self.imports.append(alias.name)
-        self.generic_visit(node)
 
-    def visit_ImportFrom(self, node: ast.ImportFrom):
-        """访问 from...import 语句"""
+    def _handle_import_from(self, node: ast.ImportFrom):
+        """处理 from...import 语句"""
         module = node.module or ''
         for alias in node.names:
             import_str = f"{module}.{alias.name}" if module else alias.name
             self.imports.append(import_str)
-        self.generic_visit(node)
+
+    def _handle_branch(self, node: ast.AST, amount: int = 1):
+        """分支点为栈上所有外层函数累加复杂度（嵌套函数计入外层，与整树扫描一致）"""
+        for func_node in self._func_stack:
+            func_node.complexity += amount
+
+    def _handle_bool_op(self, node: ast.BoolOp):
+        """布尔运算符：n 个操作数计 n-1 个分支点"""
+        self._handle_branch(node, len(node.values) - 1)
+
+    # 节点类型到处理函数的分发表（未列出的类型只下钻不处理）
+    _DISPATCH = {
+        ast.FunctionDef: _handle_function_def,
+        ast.AsyncFunctionDef: _handle_function_def,
+        ast.ClassDef: _handle_class_def,
+        ast.Import: _handle_import,
+        ast.ImportFrom: _handle_import_from,
+        # 分支语句 / 异常处理 / 推导式：每处分支点 +1
+        ast.If: _handle_branch,
+        ast.While: _handle_branch,
+        ast.For: _handle_branch,
+        ast.AsyncFor: _handle_branch,
+        ast.ExceptHandler: _handle_branch,
+        ast.ListComp: _handle_branch,
+        ast.DictComp: _handle_branch,
+        ast.SetComp: _handle_branch,
+        ast.GeneratorExp: _handle_branch,
+        ast.BoolOp: _handle_bool_op,
+    }
 
     def _get_decorator_name(self, decorator) -> str:
         """获取装饰器名称"""
@@ -188,33 +308,15 @@ class PythonASTVisitor(ast.NodeVisitor):
         return str(decorator)
 
     def _get_name(self, node) -> str:
-        """获取节点名称"""
+        """获取节点名称（迭代展开属性链，不为每层属性递归一帧）"""
         if isinstance(node, ast.Name):
             return node.id
-        elif isinstance(node, ast.Attribute):
-            value = self._get_name(node.value)
-            return f"{value}.{node.attr}"
-        return str(node)
-
-    def _calculate_complexity(self, node: ast.FunctionDef) -> int:
-        """
-        计算圈复杂度（McCabe complexity）
-        基础复杂度为 1，每个分支点 +1
-        """
-        complexity = 1
-
-        for child in ast.walk(node):
-            # 分支语句
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            # 异常处理
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            # 布尔运算符
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-            # 列表推导式
-            elif isinstance(child, (ast.ListComp, ast.DictComp, ast.SetComp, ast.GeneratorExp)):
-                complexity += 1
-
-        return complexity
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        parts.append(node.id if isinstance(node, ast.Name) else str(node))
+        if len(parts) == 1:
+            return parts[0]
+        parts.reverse()
+        return ".".join(parts)
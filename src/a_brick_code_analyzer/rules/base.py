@@ -2,25 +2,26 @@
 规则引擎基础类和数据结构
 """
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Type, TYPE_CHECKING
-from enum import Enum
+from typing import List, Dict, Any, Optional, Sequence, Type, TYPE_CHECKING
+from enum import IntEnum
 
 if TYPE_CHECKING:
     from ..base import ParseResult, CodeNode, NodeType
 
 
-class Severity(Enum):
+class Severity(IntEnum):
     """规则严重级别（ESLint 风格）"""
     OFF = 0      # 禁用
     WARN = 1     # 警告
     ERROR = 2    # 错误
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RuleViolation:
-    """规则违规信息"""
+    """规则违规信息（不可变，报告可能累积上万条）"""
     rule_id: str                    # 规则 ID，如 "complexity/max-complexity"
     severity: Severity              # 严重级别
     message: str                    # 可读消息
@@ -34,6 +35,15 @@ class RuleViolation:
     suggestion: Optional[str] = None    # 修复建议
     metadata: Dict[str, Any] = field(default_factory=dict)  # 额外元数据
 
+    def __post_init__(self):
+        # rule_id 词表很小，驻留后上万条违规共享同一批字符串
+        object.__setattr__(self, 'rule_id', sys.intern(self.rule_id))
+
+
+# 共享的"无违规"返回值：检查的绝大多数调用无命中，
+# 统一返回这个空元组而不是每次新建列表（调用方只迭代，不得修改）
+NO_VIOLATIONS: Sequence['RuleViolation'] = ()
+
 
 class BaseRule(ABC):
     """规则抽象基类"""
@@ -49,12 +59,20 @@ class BaseRule(ABC):
     # 支持的语言（空列表表示支持所有语言）
     supported_languages: List[str] = []
 
+    # 小写语言集合（定义子类时构建一次，supports_language 查集合而非逐次小写列表）
+    _supported_lower: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._supported_lower = frozenset(
+            lang.lower() for lang in cls.supported_languages)
+
     def __init__(self, severity: Severity = None, options: Dict[str, Any] = None):
         self.severity = severity if severity is not None else self.default_severity
         self.options = {**self.default_options, **(options or {})}
 
     @abstractmethod
-    def check(self, parse_result: 'ParseResult') -> List[RuleViolation]:
+    def check(self, parse_result: 'ParseResult') -> Sequence[RuleViolation]:
         """
         检查解析结果中的违规
 
@@ -62,7 +80,7 @@ class BaseRule(ABC):
             parse_result: 代码解析结果
 
         Returns:
-            违规列表
+            违规序列（无命中时可为共享的 NO_VIOLATIONS，调用方只读）
         """
         pass
 
@@ -72,9 +90,8 @@ class BaseRule(ABC):
 
     def supports_language(self, language: str) -> bool:
         """检查规则是否支持指定语言"""
-        if not self.supported_languages:
-            return True
-        return language.lower() in [lang.lower() for lang in self.supported_languages]
+        supported = self._supported_lower
+        return not supported or language.lower() in supported
 
     def create_violation(
         self,
@@ -102,17 +119,20 @@ class NodeRule(BaseRule):
     # 此规则适用的节点类型
     target_node_types: List['NodeType'] = []
 
-    def check(self, parse_result: 'ParseResult') -> List[RuleViolation]:
-        """检查解析结果中所有相关节点"""
-        violations = []
+    # 可选的批量检查入口：check_batch(parse_result) -> List[RuleViolation]。
+    # 定义了此方法的规则在 lint 中整文件调用一次（在列式视图上
+    # 预筛选候选节点，见 engine._get_lang_dispatch），不再逐节点分发
+    check_batch = None
 
+    def check(self, parse_result: 'ParseResult') -> Sequence[RuleViolation]:
+        """检查解析结果中所有相关节点"""
         if not self.supports_language(parse_result.language):
-            return violations
+            return NO_VIOLATIONS
 
+        violations = []
         for node in parse_result.nodes:
             if self._should_check_node(node):
-                node_violations = self.check_node(node, parse_result)
-                violations.extend(node_violations)
+                violations.extend(self.check_node(node, parse_result))
 
         return violations
 
@@ -123,7 +143,7 @@ class NodeRule(BaseRule):
         return node.node_type in self.target_node_types
 
     @abstractmethod
-    def check_node(self, node: 'CodeNode', parse_result: 'ParseResult') -> List[RuleViolation]:
+    def check_node(self, node: 'CodeNode', parse_result: 'ParseResult') -> Sequence[RuleViolation]:
         """
         检查单个节点
 
@@ -132,6 +152,6 @@ class NodeRule(BaseRule):
             parse_result: 完整解析结果（用于上下文）
 
         Returns:
-            此节点的违规列表
+            此节点的违规序列（无命中时可为共享的 NO_VIOLATIONS）
         """
         pass
@@ -2,12 +2,25 @@
 复杂度相关规则
 """
 
-from typing import List
+from typing import List, Sequence
 
-from ..base import NodeRule, RuleViolation, Severity
+from ..base import NO_VIOLATIONS, NodeRule, RuleViolation, Severity
+from ..._fastcheck import over_span, over_threshold
 from ...base import CodeNode, ParseResult, NodeType
 
 
+# 批量预筛选的目标类型（列式视图中的整数值）
+_TARGET_IDS = (int(NodeType.FUNCTION), int(NodeType.METHOD))
+
+
+# 消息/建议模板（模块级 %-模板，逐违规只做参数代入，不重复构造 f-string）
+_COMPLEXITY_MSG = "函数 '%s' 的圈复杂度为 %d（最大允许 %d）"
+_LINES_MSG = "函数 '%s' 有 %d 行（最大允许 %d）"
+_PARAMS_MSG = "函数 '%s' 有 %d 个参数（最大允许 %d）"
+_SPLIT_SUGGESTION = "考虑将 '%s' 拆分为更小的函数"
+_PARAMS_SUGGESTION = "考虑使用配置对象或数据类来减少参数数量"
+
+
 class MaxComplexityRule(NodeRule):
     """检查函数/方法的圈复杂度"""
 
@@ -19,22 +32,32 @@ class MaxComplexityRule(NodeRule):
     default_options = {"max": 10}
     target_node_types = [NodeType.FUNCTION, NodeType.METHOD]
 
-    def check_node(self, node: CodeNode, parse_result: ParseResult) -> List[RuleViolation]:
-        violations = []
+    def check_node(self, node: CodeNode, parse_result: ParseResult) -> Sequence[RuleViolation]:
         max_complexity = self.options.get('max', 10)
 
-        if node.complexity > max_complexity:
-            violations.append(self.create_violation(
-                message=f"函数 '{node.name}' 的圈复杂度为 {node.complexity}（最大允许 {max_complexity}）",
-                file_path=parse_result.file_path,
-                line_start=node.line_start,
-                line_end=node.line_end,
-                node_name=node.name,
-                node_type=node.node_type.value,
-                suggestion=f"考虑将 '{node.name}' 拆分为更小的函数",
-                metadata={'actual': node.complexity, 'max': max_complexity}
-            ))
-
+        if node.complexity <= max_complexity:
+            return NO_VIOLATIONS
+
+        return [self.create_violation(
+            message=_COMPLEXITY_MSG % (node.name, node.complexity, max_complexity),
+            file_path=parse_result.file_path,
+            line_start=node.line_start,
+            line_end=node.line_end,
+            node_name=node.name,
+            node_type=node.node_type.label,
+            suggestion=_SPLIT_SUGGESTION % node.name,
+            metadata={'actual': node.complexity, 'max': max_complexity}
+        )]
+
+    def check_batch(self, parse_result: ParseResult) -> List[RuleViolation]:
+        """批量检查：在复杂度列上筛选超限下标，只触碰命中的 CodeNode"""
+        columns = parse_result.get_columns()
+        nodes = parse_result.nodes
+        violations = []
+        for i in over_threshold(
+                columns.node_types, columns.complexities,
+                _TARGET_IDS, self.options.get('max', 10)):
+            violations.extend(self.check_node(nodes[i], parse_result))
         return violations
 
 
@@ -49,23 +72,33 @@ class MaxFunctionLinesRule(NodeRule):
     default_options = {"max": 50}
     target_node_types = [NodeType.FUNCTION, NodeType.METHOD]
 
-    def check_node(self, node: CodeNode, parse_result: ParseResult) -> List[RuleViolation]:
-        violations = []
+    def check_node(self, node: CodeNode, parse_result: ParseResult) -> Sequence[RuleViolation]:
         max_lines = self.options.get('max', 50)
         actual_lines = node.line_end - node.line_start + 1
 
-        if actual_lines > max_lines:
-            violations.append(self.create_violation(
-                message=f"函数 '{node.name}' 有 {actual_lines} 行（最大允许 {max_lines}）",
-                file_path=parse_result.file_path,
-                line_start=node.line_start,
-                line_end=node.line_end,
-                node_name=node.name,
-                node_type=node.node_type.value,
-                suggestion=f"考虑将 '{node.name}' 拆分为更小的函数",
-                metadata={'actual': actual_lines, 'max': max_lines}
-            ))
-
+        if actual_lines <= max_lines:
+            return NO_VIOLATIONS
+
+        return [self.create_violation(
+            message=_LINES_MSG % (node.name, actual_lines, max_lines),
+            file_path=parse_result.file_path,
+            line_start=node.line_start,
+            line_end=node.line_end,
+            node_name=node.name,
+            node_type=node.node_type.label,
+            suggestion=_SPLIT_SUGGESTION % node.name,
+            metadata={'actual': actual_lines, 'max': max_lines}
+        )]
+
+    def check_batch(self, parse_result: ParseResult) -> List[RuleViolation]:
+        """批量检查：在行号列上筛选超限下标，只触碰命中的 CodeNode"""
+        columns = parse_result.get_columns()
+        nodes = parse_result.nodes
+        violations = []
+        for i in over_span(
+                columns.node_types, columns.line_starts, columns.line_ends,
+                _TARGET_IDS, self.options.get('max', 50)):
+            violations.extend(self.check_node(nodes[i], parse_result))
         return violations
 
 
@@ -80,26 +113,46 @@ class MaxParamsRule(NodeRule):
     default_options = {"max": 5}
     target_node_types = [NodeType.FUNCTION, NodeType.METHOD]
 
-    def check_node(self, node: CodeNode, parse_result: ParseResult) -> List[RuleViolation]:
-        violations = []
+    def check_node(self, node: CodeNode, parse_result: ParseResult) -> Sequence[RuleViolation]:
         max_params = self.options.get('max', 5)
 
+        # 快速剪枝：排除 self/cls 只会让参数更少，
+        # 总数不超限就不用构建过滤后的列表（绝大多数函数走这条路）
+        if len(node.params) <= max_params:
+            return NO_VIOLATIONS
+
         # 排除 'self' 和 'cls'（Python 方法）
         params = [p for p in node.params if p not in ('self', 'cls')]
         actual_params = len(params)
 
-        if actual_params > max_params:
-            violations.append(self.create_violation(
-                message=f"函数 '{node.name}' 有 {actual_params} 个参数（最大允许 {max_params}）",
-                file_path=parse_result.file_path,
-                line_start=node.line_start,
-                line_end=node.line_end,
-                node_name=node.name,
-                node_type=node.node_type.value,
-                suggestion="考虑使用配置对象或数据类来减少参数数量",
-                metadata={'actual': actual_params, 'max': max_params, 'params': params}
-            ))
-
+        if actual_params <= max_params:
+            return NO_VIOLATIONS
+
+        return [self.create_violation(
+            message=_PARAMS_MSG % (node.name, actual_params, max_params),
+            file_path=parse_result.file_path,
+            line_start=node.line_start,
+            line_end=node.line_end,
+            node_name=node.name,
+            node_type=node.node_type.label,
+            suggestion=_PARAMS_SUGGESTION,
+            metadata={'actual': actual_params, 'max': max_params, 'params': params}
+        )]
+
+    def check_batch(self, parse_result: ParseResult) -> List[RuleViolation]:
+        """
+        批量检查：在参数计数列上筛选超限下标
+
+        列中的计数未排除 self/cls，只会偏多，
+        命中后由 check_node 做精确过滤和判定
+        """
+        columns = parse_result.get_columns()
+        nodes = parse_result.nodes
+        violations = []
+        for i in over_threshold(
+                columns.node_types, columns.param_counts,
+                _TARGET_IDS, self.options.get('max', 5)):
+            violations.extend(self.check_node(nodes[i], parse_result))
         return violations
 
 
@@ -3,12 +3,55 @@
 """
 
 import re
-from typing import List
+from typing import List, Sequence
 
-from ..base import NodeRule, RuleViolation, Severity
+from ..base import NO_VIOLATIONS, NodeRule, RuleViolation, Severity
 from ...base import CodeNode, ParseResult, NodeType
 
 
+# 命名风格正则（模块加载时编译一次，两个规则共享，
+# 逐节点 re.match(str, ...) 的缓存查找和参数解析都省掉）
+PATTERNS = {
+    'snake_case': re.compile(r'^[a-z_][a-z0-9_]*$'),
+    'camelCase': re.compile(r'^[a-z][a-zA-Z0-9]*$'),
+    'PascalCase': re.compile(r'^[A-Z][a-zA-Z0-9]*$'),
+}
+
+# 忽略的特殊方法（Python dunder 方法）
+_DUNDER_RE = re.compile(r'^__.*__$')
+
+
+# 内置风格的 C 级快速判定：普通 ASCII 标识符不进正则引擎，
+# str.strip/isalnum/isascii 都是单遍 C 循环，比 re.match 快数倍。
+# 与 PATTERNS 中对应正则语义完全一致，未知风格回退到正则
+_SNAKE_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789_'
+
+
+def _is_snake_case(name: str) -> bool:
+    # strip 掉全部合法字符后应为空串；首字符不能是数字
+    return bool(name) and not name[0].isdigit() and not name.strip(_SNAKE_CHARS)
+
+
+def _is_camel_case(name: str) -> bool:
+    return bool(name) and name.isascii() and name.isalnum() and name[0].islower()
+
+
+def _is_pascal_case(name: str) -> bool:
+    return bool(name) and name.isascii() and name.isalnum() and name[0].isupper()
+
+
+_MATCHERS = {
+    'snake_case': _is_snake_case,
+    'camelCase': _is_camel_case,
+    'PascalCase': _is_pascal_case,
+}
+
+# 消息/建议模板（模块级 %-模板，逐违规只做参数代入）
+_FUNC_MSG = "函数 '%s' 不符合 %s 命名规范"
+_CLASS_MSG = "类 '%s' 不符合 %s 命名规范"
+_RENAME_SUGGESTION = "重命名以符合 %s 规范"
+
+
 class FunctionNamingRule(NodeRule):
     """检查函数命名规范"""
 
@@ -20,41 +63,37 @@ class FunctionNamingRule(NodeRule):
     default_options = {"style": "snake_case"}
     target_node_types = [NodeType.FUNCTION, NodeType.METHOD]
 
-    PATTERNS = {
-        'snake_case': r'^[a-z_][a-z0-9_]*$',
-        'camelCase': r'^[a-z][a-zA-Z0-9]*$',
-        'PascalCase': r'^[A-Z][a-zA-Z0-9]*$',
-    }
+    PATTERNS = PATTERNS
 
-    # 忽略的特殊方法（Python dunder 方法）
-    IGNORE_PATTERNS = [r'^__.*__$']
+    def __init__(self, severity: Severity = None, options: dict = None):
+        super().__init__(severity, options)
+        # 风格在实例生命周期内不变，样式查找提前到构造时
+        self._style = self.options.get('style', 'snake_case')
+        self._pattern = self.PATTERNS.get(self._style)
+        self._match = _MATCHERS.get(self._style) or (
+            self._pattern.match if self._pattern else None)
 
-    def check_node(self, node: CodeNode, parse_result: ParseResult) -> List[RuleViolation]:
-        violations = []
-        style = self.options.get('style', 'snake_case')
-        pattern = self.PATTERNS.get(style)
+    def check_node(self, node: CodeNode, parse_result: ParseResult) -> Sequence[RuleViolation]:
+        match = self._match
 
-        if not pattern:
-            return violations
+        if match is None or match(node.name):
+            return NO_VIOLATIONS
 
         # 跳过特殊方法
-        for ignore_pattern in self.IGNORE_PATTERNS:
-            if re.match(ignore_pattern, node.name):
-                return violations
-
-        if not re.match(pattern, node.name):
-            violations.append(self.create_violation(
-                message=f"函数 '{node.name}' 不符合 {style} 命名规范",
-                file_path=parse_result.file_path,
-                line_start=node.line_start,
-                line_end=node.line_end,
-                node_name=node.name,
-                node_type=node.node_type.value,
-                suggestion=f"重命名以符合 {style} 规范",
-                metadata={'style': style, 'pattern': pattern}
-            ))
-
-        return violations
+        if _DUNDER_RE.match(node.name):
+            return NO_VIOLATIONS
+
+        style = self._style
+        return [self.create_violation(
+            message=_FUNC_MSG % (node.name, style),
+            file_path=parse_result.file_path,
+            line_start=node.line_start,
+            line_end=node.line_end,
+            node_name=node.name,
+            node_type=node.node_type.label,
+            suggestion=_RENAME_SUGGESTION % style,
+            metadata={'style': style, 'pattern': self._pattern.pattern}
+        )]
 
 
 class ClassNamingRule(NodeRule):
@@ -68,33 +107,32 @@ class ClassNamingRule(NodeRule):
     default_options = {"style": "PascalCase"}
     target_node_types = [NodeType.CLASS]
 
-    PATTERNS = {
-        'snake_case': r'^[a-z_][a-z0-9_]*$',
-        'camelCase': r'^[a-z][a-zA-Z0-9]*$',
-        'PascalCase': r'^[A-Z][a-zA-Z0-9]*$',
-    }
-
-    def check_node(self, node: CodeNode, parse_result: ParseResult) -> List[RuleViolation]:
-        violations = []
-        style = self.options.get('style', 'PascalCase')
-        pattern = self.PATTERNS.get(style)
-
-        if not pattern:
-            return violations
-
-        if not re.match(pattern, node.name):
-            violations.append(self.create_violation(
-                message=f"类 '{node.name}' 不符合 {style} 命名规范",
-                file_path=parse_result.file_path,
-                line_start=node.line_start,
-                line_end=node.line_end,
-                node_name=node.name,
-                node_type=node.node_type.value,
-                suggestion=f"重命名以符合 {style} 规范",
-                metadata={'style': style, 'pattern': pattern}
-            ))
-
-        return violations
+    PATTERNS = PATTERNS
+
+    def __init__(self, severity: Severity = None, options: dict = None):
+        super().__init__(severity, options)
+        self._style = self.options.get('style', 'PascalCase')
+        self._pattern = self.PATTERNS.get(self._style)
+        self._match = _MATCHERS.get(self._style) or (
+            self._pattern.match if self._pattern else None)
+
+    def check_node(self, node: CodeNode, parse_result: ParseResult) -> Sequence[RuleViolation]:
+        match = self._match
+
+        if match is None or match(node.name):
+            return NO_VIOLATIONS
+
+        style = self._style
+        return [self.create_violation(
+            message=_CLASS_MSG % (node.name, style),
+            file_path=parse_result.file_path,
+            line_start=node.line_start,
+            line_end=node.line_end,
+            node_name=node.name,
+            node_type=node.node_type.label,
+            suggestion=_RENAME_SUGGESTION % style,
+            metadata={'style': style, 'pattern': self._pattern.pattern}
+        )]
 
 
 # 导出所有命名规则
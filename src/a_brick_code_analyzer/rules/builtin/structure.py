@@ -5,7 +5,12 @@
 from typing import List
 
 from ..base import BaseRule, RuleViolation, Severity
-from ...base import ParseResult
+from ...base import ParseResult, NodeType
+
+
+# 列式视图中的类型值（计数走 array.count 的 C 实现）
+_CLASS_ID = int(NodeType.CLASS)
+_FUNCTION_ID = int(NodeType.FUNCTION)
 
 
 class MaxFileLinesRule(BaseRule):
@@ -49,10 +54,12 @@ class MaxClassesPerFileRule(BaseRule):
         violations = []
         max_classes = self.options.get('max', 5)
 
-        classes = parse_result.get_classes()
-        actual_classes = len(classes)
+        # 在列式视图上计数（C 层 count，复用复杂度规则已构建的列），
+        # 名称列表只在确实违规时才构造
+        actual_classes = parse_result.get_columns().node_types.count(_CLASS_ID)
 
         if actual_classes > max_classes:
+            classes = parse_result.get_classes()
             violations.append(self.create_violation(
                 message=f"文件有 {actual_classes} 个类（最大允许 {max_classes}）",
                 file_path=parse_result.file_path,
@@ -83,10 +90,11 @@ class MaxFunctionsPerFileRule(BaseRule):
         violations = []
         max_functions = self.options.get('max', 20)
 
-        functions = parse_result.get_functions()
-        actual_functions = len(functions)
+        # 同 MaxClassesPerFileRule：列上计数，违规时才取名称
+        actual_functions = parse_result.get_columns().node_types.count(_FUNCTION_ID)
 
         if actual_functions > max_functions:
+            functions = parse_result.get_functions()
             violations.append(self.create_violation(
                 message=f"文件有 {actual_functions} 个函数（最大允许 {max_functions}）",
                 file_path=parse_result.file_path,
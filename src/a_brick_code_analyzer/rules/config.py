@@ -3,18 +3,36 @@
 """
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 
 from .base import Severity
 
-# 尝试导入 YAML 支持
+# YAML 支持延迟到首次加载 .yaml 配置时导入（见 _load_file）：
+# yaml 冷导入约几十毫秒，JSON 配置的 CLI 调用不必付这笔启动开销
+YAML_AVAILABLE = None
+
+# JSON 解析优先走 orjson（C 实现，小文件也快数倍），未安装则回退标准库
 try:
-    import yaml
-    YAML_AVAILABLE = True
+    import orjson
+    _json_loads = orjson.loads
+    ORJSON_AVAILABLE = True
 except ImportError:
-    YAML_AVAILABLE = False
+    _json_loads = json.loads
+    ORJSON_AVAILABLE = False
+
+
+# severity 取值到枚举的映射（一次 dict 查找，不走 Enum 的名称查找）
+_SEV_MAP = {
+    'off': Severity.OFF,
+    'warn': Severity.WARN,
+    'error': Severity.ERROR,
+    0: Severity.OFF,
+    1: Severity.WARN,
+    2: Severity.ERROR,
+}
 
 
 @dataclass
@@ -80,17 +98,22 @@ class RuleConfig:
         file_path = Path(path)
 
         if file_path.suffix == '.json':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 整读字节再一次性解析，比流式 json.load 少一层缓冲包装
+            data = _json_loads(file_path.read_bytes())
         elif file_path.suffix in ('.yaml', '.yml'):
-            if not YAML_AVAILABLE:
+            global YAML_AVAILABLE
+            try:
+                import yaml
+                YAML_AVAILABLE = True
+            except ImportError:
+                YAML_AVAILABLE = False
                 raise ImportError("需要安装 PyYAML 来支持 YAML 配置文件: pip install pyyaml")
             with open(file_path, 'r', encoding='utf-8') as f:
                 data = yaml.safe_load(f)
         else:
             raise ValueError(f"不支持的配置文件格式: {file_path.suffix}")
 
-        return cls._from_dict(data)
+        return cls.from_dict(data)
 
     @classmethod
     def _load_pyproject(cls, path: str) -> Optional['RuleConfig']:
@@ -108,12 +131,12 @@ class RuleConfig:
 
         analyzer_config = data.get('tool', {}).get('analyzer', {})
         if analyzer_config:
-            return cls._from_dict(analyzer_config)
+            return cls.from_dict(analyzer_config)
         return None
 
     @classmethod
-    def _from_dict(cls, data: Dict[str, Any]) -> 'RuleConfig':
-        """从字典创建配置"""
+    def from_dict(cls, data: Dict[str, Any]) -> 'RuleConfig':
+        """从字典创建配置（extends/rules 语义与配置文件一致，不经过文件 I/O）"""
         config = cls()
 
         # 处理 extends
@@ -137,32 +160,47 @@ class RuleConfig:
 
         return config
 
+    # ESLint 风格配置的解析表：按具体类型分发，
+    # 比逐个 isinstance 级联少走 MRO 检查（最常见的 dict 原来排在最后）
+    _RULE_CONFIG_HANDLERS = {
+        dict: lambda c: {
+            'severity': c.get('severity', 'warn'),
+            'options': c.get('options', {}),
+        },
+        list: lambda c: {
+            'severity': c[0] if c else 'warn',
+            'options': c[1] if len(c) > 1 else {},
+        },
+        str: lambda c: {'severity': c, 'options': {}},
+        int: lambda c: {'severity': c, 'options': {}},
+    }
+
     @classmethod
     def _parse_rule_config(cls, config) -> Dict[str, Any]:
         """解析单个规则配置"""
         # ESLint 风格: 可以是单独的 severity 或 [severity, options]
-        if isinstance(config, (int, str)):
-            return {'severity': config, 'options': {}}
-        elif isinstance(config, list):
-            severity = config[0] if config else 'warn'
-            options = config[1] if len(config) > 1 else {}
-            return {'severity': severity, 'options': options}
-        elif isinstance(config, dict):
-            return {
-                'severity': config.get('severity', 'warn'),
-                'options': config.get('options', {})
-            }
-        return {'severity': 'warn', 'options': {}}
+        handler = cls._RULE_CONFIG_HANDLERS.get(type(config))
+        if handler is None:
+            return {'severity': 'warn', 'options': {}}
+        return handler(config)
 
     @classmethod
     def _load_preset(cls, name: str) -> 'RuleConfig':
-        """加载预设配置"""
-        presets = {
-            'recommended': cls._get_recommended_config(),
-            'strict': cls._get_strict_config(),
-            'minimal': cls._get_minimal_config(),
-        }
-        return presets.get(name, cls())
+        """
+        加载预设配置
+
+        预设工厂本身带 lru_cache，实例构建一次后共享：调用方只读取
+        rules/ignore_patterns，合并时（见 from_dict）写入的是自己的
+        字典，不会污染缓存。未知名称返回新的空配置，不进缓存
+        """
+        factory = {
+            'recommended': cls._get_recommended_config,
+            'strict': cls._get_strict_config,
+            'minimal': cls._get_minimal_config,
+        }.get(name)
+        if factory is None:
+            return cls()
+        return factory()
 
     @classmethod
     def _get_default_config(cls) -> 'RuleConfig':
@@ -170,6 +208,7 @@ class RuleConfig:
         return cls._get_recommended_config()
 
     @classmethod
+    @lru_cache(maxsize=1)
     def _get_recommended_config(cls) -> 'RuleConfig':
         """推荐预设 - 平衡的规则"""
         return cls(rules={
@@ -184,6 +223,7 @@ class RuleConfig:
         })
 
     @classmethod
+    @lru_cache(maxsize=1)
     def _get_strict_config(cls) -> 'RuleConfig':
         """严格预设 - 所有规则为 error"""
         return cls(rules={
@@ -198,6 +238,7 @@ class RuleConfig:
         })
 
     @classmethod
+    @lru_cache(maxsize=1)
     def _get_minimal_config(cls) -> 'RuleConfig':
         """最小预设 - 仅关键规则"""
         return cls(rules={
@@ -212,8 +253,6 @@ class RuleConfig:
         """解析 severity 值"""
         if isinstance(value, Severity):
             return value
-        if isinstance(value, int):
-            return Severity(value)
         if isinstance(value, str):
-            return Severity[value.upper()]
-        return Severity.WARN
+            value = value.lower()
+        return _SEV_MAP.get(value, Severity.WARN)
@@ -2,15 +2,71 @@
 规则引擎核心
 """
 
-from pathlib import Path
-from typing import List, Dict, Type, Optional
+import hashlib
+import mmap
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, KeysView, List, Dict, Tuple, Type, Optional
 import fnmatch
 
-from .base import BaseRule, Severity
+from .base import BaseRule, NodeRule, Severity
 from .result import LintResult, LintReport
 from .config import RuleConfig
 
 
+@lru_cache(maxsize=32)
+def _compile_preset_plan(
+    preset_name: str,
+    rule_classes: Tuple[Type[BaseRule], ...]
+) -> Tuple[Tuple[str, BaseRule], ...]:
+    """
+    将预设编译为 (rule_id, 规则实例) 元组并缓存
+
+    规则实例在检查期间无状态，同一预设下可以跨引擎共享，
+    重复 use_preset 时省去重新解析配置和构造规则的开销
+    """
+    config = RuleConfig._load_preset(preset_name)
+    plan = []
+    for rule_class in rule_classes:
+        rule_config = config.get_rule_config(rule_class.rule_id)
+        if rule_config:
+            severity = config.parse_severity(
+                rule_config.get('severity', rule_class.default_severity))
+            if severity == Severity.OFF:
+                continue
+            plan.append((rule_class.rule_id, rule_class(
+                severity=severity, options=rule_config.get('options', {}))))
+        else:
+            # 未配置的规则使用默认值
+            plan.append((rule_class.rule_id, rule_class()))
+    return tuple(plan)
+
+
+# 工作进程的引擎实例（由 _init_lint_worker 构建一次，进程内所有文件复用）
+_worker_engine = None
+
+# 内置规则的 rule_id -> 规则类映射（首次注册时构建一次，进程内共享）
+_builtin_classes: Optional[Dict[str, Type[BaseRule]]] = None
+
+
+def _init_lint_worker(plan_bytes: bytes):
+    """进程池 initializer：从序列化的规则计划重建工作进程引擎"""
+    global _worker_engine
+    engine = RuleEngine()
+    engine._rules = dict(pickle.loads(plan_bytes))
+    for rule_id, rule in engine._rules.items():
+        engine._rule_classes[rule_id] = type(rule)
+    _worker_engine = engine
+
+
+def _lint_one(file_path: str) -> 'LintResult':
+    """在工作进程中检查单个文件"""
+    return _worker_engine.lint_file(file_path)
+
+
 class RuleEngine:
     """规则引擎核心类"""
 
@@ -18,26 +74,80 @@ class RuleEngine:
         self._rules: Dict[str, BaseRule] = {}
         self._rule_classes: Dict[str, Type[BaseRule]] = {}
         self._config: Optional[RuleConfig] = None
+        # 节点规则分发表缓存（规则集变化时置空重建，见 _get_dispatch）
+        self._dispatch = None
+        # 忽略模式的合并正则（配置变化时置空，首次使用惰性编译）
+        self._ignore_re = None
+        # 生效规则集的摘要（持久化 lint 缓存键的一部分，见 _get_rules_digest）
+        self._rules_digest = None
+
+    @classmethod
+    def from_preset(cls, preset_name: str) -> 'RuleEngine':
+        """构建注册了内置规则并应用指定预设的引擎"""
+        engine = cls()
+        engine.register_builtin_rules()
+        engine.use_preset(preset_name)
+        return engine
+
+    def dump_plan(self, path: str):
+        """
+        将当前规则计划序列化到磁盘
+
+        供 load_plan 在工作进程中直接加载，
+        跳过规则注册和配置解析
+        """
+        plan = tuple(self._rules.items())
+        with open(path, 'wb') as f:
+            pickle.dump(plan, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load_plan(cls, path: str) -> 'RuleEngine':
+        """从磁盘加载规则计划（mmap 零拷贝读入后反序列化）"""
+        engine = cls()
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                plan = pickle.loads(mm)
+        engine._rules = dict(plan)
+        engine._dispatch = None
+        engine._rules_digest = None
+        for rule_id, rule in engine._rules.items():
+            engine._rule_classes[rule_id] = type(rule)
+        return engine
 
     def register_rule(self, rule_class: Type[BaseRule]):
         """注册规则类"""
         self._rule_classes[rule_class.rule_id] = rule_class
 
     def register_builtin_rules(self):
-        """注册所有内置规则"""
-        from .builtin import get_all_builtin_rules
-        for rule_class in get_all_builtin_rules():
-            self.register_rule(rule_class)
+        """
+        注册所有内置规则
+
+        映射表进程内构建一次（规则类无状态，severity/options 在实例化
+        时才进入），重复调用只是一次字典合并，天然幂等
+        """
+        global _builtin_classes
+        if _builtin_classes is None:
+            from .builtin import get_all_builtin_rules
+            _builtin_classes = {
+                rule_class.rule_id: rule_class
+                for rule_class in get_all_builtin_rules()
+            }
+        self._rule_classes.update(_builtin_classes)
 
     def load_config(self, config_path: str = None, search_dir: str = None):
         """从文件加载配置"""
         self._config = RuleConfig.load(config_path, search_dir)
+        self._ignore_re = None
         self._apply_config()
 
     def use_preset(self, preset_name: str):
-        """使用预设配置"""
+        """使用预设配置（编译结果跨引擎缓存）"""
         self._config = RuleConfig._load_preset(preset_name)
-        self._apply_config()
+        self._ignore_re = None
+        plan = _compile_preset_plan(preset_name, tuple(self._rule_classes.values()))
+        self._rules = dict(plan)
+        self._dispatch = None
+        self._rules_digest = None
 
     def _apply_config(self):
         """应用配置到规则"""
@@ -45,6 +155,8 @@ class RuleEngine:
             return
 
         self._rules.clear()
+        self._dispatch = None
+        self._rules_digest = None
 
         for rule_id, rule_class in self._rule_classes.items():
             rule_config = self._config.get_rule_config(rule_id)
@@ -67,6 +179,8 @@ class RuleEngine:
             raise ValueError(f"未知规则: {rule_id}")
 
         rule_class = self._rule_classes[rule_id]
+        self._dispatch = None
+        self._rules_digest = None
 
         if severity == Severity.OFF:
             # 禁用规则
@@ -78,10 +192,85 @@ class RuleEngine:
                 options=options or {}
             )
 
+    def _get_dispatch(self):
+        """
+        构建（或返回缓存的）规则分发表
+
+        节点规则按 target_node_types 预分桶：
+        lint 对节点列表只扫一遍，而不是每个规则各扫一遍；
+        文件级规则单独成组，照常走 check()
+        """
+        dispatch = self._dispatch
+        if dispatch is None:
+            typed: Dict = {}
+            untyped = []
+            file_rules = []
+            for rule in self._rules.values():
+                if isinstance(rule, NodeRule):
+                    if rule.target_node_types:
+                        for node_type in rule.target_node_types:
+                            typed.setdefault(node_type, []).append(rule)
+                    else:
+                        untyped.append(rule)
+                else:
+                    file_rules.append(rule)
+            # 末位的空字典按语言缓存过滤结果（见 _get_lang_dispatch），
+            # 分发表重建时随之作废
+            dispatch = self._dispatch = (typed, untyped, file_rules, {})
+        return dispatch
+
+    def _get_lang_dispatch(self, language: str):
+        """
+        返回指定语言的已过滤分发表
+
+        启用状态和语言支持都是规则实例的静态属性，
+        按语言过滤一次并缓存，lint 的内层循环不再逐 (文件, 规则) 调用
+        is_enabled/supports_language
+        """
+        typed, untyped, file_rules, lang_cache = self._get_dispatch()
+        entry = lang_cache.get(language)
+        if entry is None:
+            # 定义了 check_batch 的规则整文件调用一次，不进逐节点分发；
+            # 同一规则可能挂在多个类型桶下，按身份去重
+            batch_active = []
+            batch_seen = set()
+
+            def _take(rule):
+                if rule.check_batch is None:
+                    return True
+                if id(rule) not in batch_seen:
+                    batch_seen.add(id(rule))
+                    batch_active.append(rule)
+                return False
+
+            untyped_active = tuple(
+                r for r in untyped
+                if r.is_enabled() and r.supports_language(language) and _take(r)
+            )
+            active = {}
+            for node_type, rules in typed.items():
+                hit = [
+                    r for r in rules
+                    if r.is_enabled() and r.supports_language(language) and _take(r)
+                ]
+                hit.extend(untyped_active)
+                if hit:
+                    active[node_type] = tuple(hit)
+            file_active = tuple(
+                r for r in file_rules
+                if r.is_enabled() and r.supports_language(language)
+            )
+            entry = lang_cache[language] = (
+                active, untyped_active, file_active, tuple(batch_active))
+        return entry
+
     def lint(self, parse_result) -> LintResult:
         """
         检查单个解析结果
 
+        所有节点规则在一次节点扫描中分发（见 _get_dispatch），
+        避免 R 个规则各自遍历一遍节点列表
+
         Args:
             parse_result: 代码解析结果
 
@@ -93,26 +282,84 @@ class RuleEngine:
         # 添加解析错误
         result.parse_errors = parse_result.errors.copy()
 
-        # 运行所有启用的规则
-        for rule in self._rules.values():
-            if rule.is_enabled() and rule.supports_language(parse_result.language):
-                violations = rule.check(parse_result)
-                for violation in violations:
-                    result.add_violation(violation)
+        active, untyped_active, file_rules, batch_rules = self._get_lang_dispatch(
+            parse_result.language)
+        add_violation = result.add_violation
+
+        # 文件级规则
+        for rule in file_rules:
+            for violation in rule.check(parse_result):
+                add_violation(violation)
+
+        # 批量规则：在列式视图上预筛选，只为命中节点构造违规
+        for rule in batch_rules:
+            for violation in rule.check_batch(parse_result):
+                add_violation(violation)
+
+        # 节点级规则：融合为单次节点扫描
+        if active or untyped_active:
+            active_get = active.get
+            for node in parse_result.nodes:
+                for rule in active_get(node.node_type, untyped_active):
+                    for violation in rule.check_node(node, parse_result):
+                        add_violation(violation)
 
         return result
 
-    def lint_file(self, file_path: str) -> LintResult:
+    def _get_rules_digest(self) -> bytes:
         """
-        检查单个文件
+        计算（并缓存）生效规则集的摘要
+
+        由 (rule_id, severity, options) 的稳定序列化得出，
+        规则集变化时随分发表一起作废
+        """
+        digest = self._rules_digest
+        if digest is None:
+            spec = repr(sorted(
+                (rule_id, int(rule.severity), sorted(rule.options.items()))
+                for rule_id, rule in self._rules.items()))
+            digest = self._rules_digest = hashlib.sha256(
+                spec.encode('utf-8')).digest()
+        return digest
+
+    def lint_many(self, parse_results) -> LintReport:
+        """
+        检查多个已有的解析结果并聚合为报告
+
+        与 lint_files 不同，输入是解析结果而非文件路径：不做解析器
+        查找和结果缓存，分发表在首个文件后即已缓存（见 _get_dispatch），
+        逐文件只剩规则检查本身
+
+        Args:
+            parse_results: 解析结果的可迭代对象
+
+        Returns:
+            LintReport 聚合结果
+        """
+        report = LintReport()
+        lint = self.lint
+        add_result = report.add_result
+        for parse_result in parse_results:
+            add_result(lint(parse_result))
+        return report
+
+    def lint_file(self, file_path: str, cache: bool = True) -> LintResult:
+        """
+        检查单个文件（带持久化结果缓存）
+
+        以文件内容 + 生效规则配置的联合摘要为键查持久化缓存（见 lint_cache）：
+        文件和规则集都没变时跳过整条解析 + 检查流水线，
+        增量 re-lint 只处理改动过的文件
 
         Args:
             file_path: 文件路径
+            cache: 是否使用持久化结果缓存
 
         Returns:
             LintResult 包含所有违规
         """
         from ..factory import ParserFactory
+        from .lint_cache import get_default_cache
 
         parser = ParserFactory.get_parser_by_file(file_path)
         if not parser:
@@ -120,31 +367,86 @@ class RuleEngine:
             result.parse_errors.append(f"没有可用的解析器: {file_path}")
             return result
 
+        digest = None
+        if cache:
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                # 无法读取时走原始路径，由解析器报告错误
+                data = None
+            if data is not None:
+                digest = hashlib.sha256(
+                    data + self._get_rules_digest()).digest()
+                cached = get_default_cache().get(file_path, digest)
+                if cached is not None:
+                    return cached
+
         parse_result = parser.parse_file(file_path)
-        return self.lint(parse_result)
+        result = self.lint(parse_result)
+        if digest is not None:
+            get_default_cache().put(file_path, digest, result)
+        return result
 
-    def lint_files(self, file_paths: List[str]) -> LintReport:
+    def lint_files(
+        self,
+        file_paths: List[str],
+        workers: int = None,
+        sink: Callable[[LintResult], None] = None
+    ) -> LintReport:
         """
         检查多个文件
 
+        每个文件的解析 + 规则检查相互独立且受 GIL 限制，
+        文件较多时分发到进程池并行；规则计划序列化一次，
+        由 initializer 在每个工作进程中重建引擎
+
         Args:
             file_paths: 文件路径列表
+            workers: 工作进程数（None 取 CPU 核数；<=1 或文件很少时串行）
+            sink: 流式输出回调。提供时逐文件调用 sink(result) 交由调用方
+                落盘（如 JSON Lines），报告只维护聚合计数不保留结果，
+                峰值内存约为单个文件的违规量 + 计数器
 
         Returns:
-            LintReport 聚合结果
+            LintReport 聚合结果（流式模式下 results 为空，计数仍然完整）
         """
+        paths = [p for p in file_paths if not self._should_ignore(p)]
         report = LintReport()
-        for file_path in file_paths:
-            if not self._should_ignore(file_path):
-                result = self.lint_file(file_path)
-                report.add_result(result)
+
+        if sink is None:
+            consume = report.add_result
+        else:
+            def consume(result):
+                report.tally_result(result)
+                sink(result)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or len(paths) < 4:
+            for file_path in paths:
+                consume(self.lint_file(file_path))
+            return report
+
+        plan_bytes = pickle.dumps(
+            tuple(self._rules.items()), protocol=pickle.HIGHEST_PROTOCOL)
+        chunksize = max(1, len(paths) // (4 * workers))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_lint_worker,
+            initargs=(plan_bytes,),
+        ) as executor:
+            for result in executor.map(_lint_one, paths, chunksize=chunksize):
+                consume(result)
         return report
 
     def lint_directory(
         self,
         directory: str,
         recursive: bool = True,
-        extensions: List[str] = None
+        extensions: List[str] = None,
+        workers: int = None,
+        sink: Callable[[LintResult], None] = None
     ) -> LintReport:
         """
         检查目录中的所有文件
@@ -153,6 +455,8 @@ class RuleEngine:
             directory: 目录路径
             recursive: 是否递归搜索
             extensions: 要包含的文件扩展名（默认：所有支持的扩展名）
+            workers: 工作进程数（透传给 lint_files）
+            sink: 流式输出回调（透传给 lint_files）
 
         Returns:
             LintReport 聚合结果
@@ -162,24 +466,36 @@ class RuleEngine:
         if extensions is None:
             extensions = ParserFactory.get_supported_extensions()
 
-        dir_path = Path(directory)
-        pattern = "**/*" if recursive else "*"
-
+        # 单次 scandir 遍历 + 扩展名集合过滤：
+        # 逐扩展名 glob 会把目录树完整扫 len(extensions) 遍
+        ext_set = tuple(extensions)
         file_paths = []
-        for ext in extensions:
-            file_paths.extend(str(p) for p in dir_path.glob(f"{pattern}{ext}"))
 
-        return self.lint_files(file_paths)
+        def _walk(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and not self._should_ignore(entry.path):
+                            _walk(entry.path)
+                    elif entry.name.endswith(ext_set):
+                        file_paths.append(entry.path)
+
+        _walk(directory)
+        return self.lint_files(file_paths, workers=workers, sink=sink)
 
     def _should_ignore(self, file_path: str) -> bool:
         """检查文件是否应该被忽略"""
         if not self._config or not self._config.ignore_patterns:
             return False
 
-        for pattern in self._config.ignore_patterns:
-            if fnmatch.fnmatch(file_path, pattern):
-                return True
-        return False
+        # 所有忽略模式合并为一个正则，编译一次后逐文件只做一次 match，
+        # 不再每文件 × 每模式地走 fnmatch 的翻译/缓存查找
+        ignore_re = self._ignore_re
+        if ignore_re is None:
+            ignore_re = self._ignore_re = re.compile('|'.join(
+                f'(?:{fnmatch.translate(p)})'
+                for p in self._config.ignore_patterns))
+        return ignore_re.match(file_path) is not None
 
     def get_enabled_rules(self) -> List[BaseRule]:
         """获取已启用的规则列表"""
@@ -189,6 +505,6 @@ class RuleEngine:
         """根据 ID 获取规则"""
         return self._rules.get(rule_id)
 
-    def get_registered_rules(self) -> List[str]:
-        """获取所有已注册的规则 ID"""
-        return list(self._rule_classes.keys())
+    def get_registered_rules(self) -> KeysView[str]:
+        """获取所有已注册的规则 ID（字典键视图：成员判断 O(1)，支持集合运算）"""
+        return self._rule_classes.keys()
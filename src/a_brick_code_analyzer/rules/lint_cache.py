@@ -0,0 +1,119 @@
+"""
+持久化 Lint 结果缓存
+以 (路径, 内容+规则配置摘要) 为键将 LintResult 存入 SQLite，跨进程复用
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+from typing import Optional
+
+from .result import LintResult
+
+
+# 默认缓存数据库位置
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'a_brick_code_analyzer', 'lint_cache.db')
+
+
+class LintCache:
+    """
+    LintResult 的持久化缓存
+
+    键为 (文件路径, 文件内容与生效规则配置的联合 SHA-256)：
+    文件和规则集都没变时整条流水线（解析 + 规则检查）直接跳过，
+    增量 re-lint 只为改动过的文件付出代价。
+    payload 为 pickle 序列化的 LintResult。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        # 连接不跨线程共享，按线程懒建
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        """获取（必要时创建）当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            # WAL + NORMAL：写入不阻塞读取，且避免每次提交都 fsync
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lint_cache ("
+                "path TEXT, sha BLOB, payload BLOB, "
+                "PRIMARY KEY (path, sha))")
+            self._local.conn = conn
+        return conn
+
+    def get(self, path: str, digest: bytes) -> Optional[LintResult]:
+        """
+        查询缓存
+
+        Args:
+            path: 文件路径
+            digest: 文件内容 + 规则配置的联合摘要
+
+        Returns:
+            Optional[LintResult]: 命中时返回反序列化的检查结果，否则 None
+        """
+        try:
+            row = self._conn().execute(
+                "SELECT payload FROM lint_cache WHERE path = ? AND sha = ?",
+                (path, digest)).fetchone()
+            if row is None:
+                return None
+            return pickle.loads(row[0])
+        except Exception:
+            # 缓存损坏或数据库不可用时视为未命中
+            return None
+
+    def put(self, path: str, digest: bytes, result: LintResult):
+        """
+        写入缓存
+
+        Args:
+            path: 文件路径
+            digest: 文件内容 + 规则配置的联合摘要
+            result: 检查结果
+        """
+        try:
+            conn = self._conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO lint_cache (path, sha, payload) "
+                "VALUES (?, ?, ?)",
+                (path, digest,
+                 pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)))
+            conn.commit()
+        except sqlite3.Error:
+            # 缓存写入失败不影响检查结果
+            pass
+
+    def clear(self):
+        """清空缓存"""
+        try:
+            conn = self._conn()
+            conn.execute("DELETE FROM lint_cache")
+            conn.commit()
+        except sqlite3.Error:
+            pass
+
+
+# 进程内共享的默认缓存实例
+_default_cache: Optional[LintCache] = None
+
+
+def get_default_cache() -> LintCache:
+    """获取（必要时创建）默认的持久化 Lint 缓存"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = LintCache()
+    return _default_cache
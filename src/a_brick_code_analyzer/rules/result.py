@@ -2,28 +2,82 @@
 Lint 结果数据结构
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List
 
 from .base import RuleViolation, Severity
 
 
-@dataclass
+# 每个工作进程中共享的规则引擎（由 _init_worker 初始化一次）
+_worker_engine = None
+
+
+def _init_worker(preset: str):
+    """工作进程初始化：构建引擎并应用预设，进程生命周期内复用"""
+    global _worker_engine
+    from .engine import RuleEngine
+    _worker_engine = RuleEngine.from_preset(preset)
+
+
+def _worker_lint(file_path: str) -> 'LintResult':
+    """在工作进程中检查单个文件"""
+    return _worker_engine.lint_file(file_path)
+
+
+@dataclass(slots=True)
 class LintResult:
     """单个文件的 lint 结果"""
     file_path: str
     violations: List[RuleViolation] = field(default_factory=list)
-    error_count: int = 0
-    warning_count: int = 0
     parse_errors: List[str] = field(default_factory=list)
 
+    # 按严重级别的计数器，以 int(severity) 为下标（OFF/WARN/ERROR）：
+    # 添加时无分支 += 1，读取为 O(1) 下标访问
+    _counts: List[int] = field(
+        default_factory=lambda: [0, 0, 0],
+        init=False, repr=False, compare=False)
+
+    # rule_id -> 违规列表，添加时顺带分桶：
+    # 按规则查询是哈希查找，不再整列表过滤
+    _by_rule: Dict[str, List[RuleViolation]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
     def add_violation(self, violation: RuleViolation):
-        """添加违规并更新计数"""
+        """添加违规并记录严重级别、按规则分桶"""
         self.violations.append(violation)
-        if violation.severity == Severity.ERROR:
-            self.error_count += 1
-        elif violation.severity == Severity.WARN:
-            self.warning_count += 1
+        self._counts[violation.severity] += 1
+        self._by_rule.setdefault(violation.rule_id, []).append(violation)
+
+    def violations_by_rule(self, rule_id: str) -> List[RuleViolation]:
+        """获取指定规则的违规列表（O(1) 桶查找）"""
+        return self._by_rule.get(rule_id, [])
+
+    def violations_by_category(self, category: str) -> List[RuleViolation]:
+        """
+        获取指定类别（rule_id 的 '/' 前缀，如 'naming'）的违规列表
+
+        只扫描规则桶的键而不是整个违规列表，
+        类别数远小于违规数时开销可忽略
+        """
+        prefix = category + '/'
+        matched: List[RuleViolation] = []
+        for rule_id, violations in self._by_rule.items():
+            if rule_id.startswith(prefix):
+                matched.extend(violations)
+        return matched
+
+    @property
+    def error_count(self) -> int:
+        """错误数"""
+        return self._counts[Severity.ERROR]
+
+    @property
+    def warning_count(self) -> int:
+        """警告数"""
+        return self._counts[Severity.WARN]
 
     @property
     def has_errors(self) -> bool:
@@ -41,48 +95,118 @@ class LintResult:
         return len(self.violations) > 0 or len(self.parse_errors) > 0
 
 
-@dataclass
+@dataclass(slots=True)
 class LintReport:
     """多个文件的聚合 lint 报告"""
     results: List[LintResult] = field(default_factory=list)
 
+    # 聚合计数在 add_result 时增量维护，
+    # 各 total_* 属性为 O(1) 读取而不是每次全量求和
+    _total_errors: int = field(default=0, init=False, repr=False, compare=False)
+    _total_warnings: int = field(default=0, init=False, repr=False, compare=False)
+    _total_violations: int = field(default=0, init=False, repr=False, compare=False)
+    _total_files: int = field(default=0, init=False, repr=False, compare=False)
+    _files_with_issues: int = field(default=0, init=False, repr=False, compare=False)
+
     def add_result(self, result: LintResult):
-        """添加单个文件的结果"""
+        """添加单个文件的结果并更新聚合计数"""
         self.results.append(result)
+        self.tally_result(result)
+
+    def tally_result(self, result: LintResult):
+        """
+        仅累计聚合计数，不保留结果本身
+
+        流式输出时（见 RuleEngine.lint_files 的 sink 参数）逐文件结果
+        交给调用方落盘，报告只维护计数器，峰值内存与仓库大小无关
+        """
+        self._total_errors += result.error_count
+        self._total_warnings += result.warning_count
+        self._total_violations += len(result.violations)
+        self._total_files += 1
+        if result.has_issues:
+            self._files_with_issues += 1
+
+    @classmethod
+    def from_files(
+        cls,
+        file_paths: Iterable[str],
+        preset: str = 'recommended',
+        workers: int = None
+    ) -> 'LintReport':
+        """
+        并行检查多个文件
+
+        解析和规则检查都是 CPU 密集且逐文件独立的，
+        用进程池按文件分发，每个工作进程只构建一次引擎
+
+        Args:
+            file_paths: 文件路径列表
+            preset: 预设配置名称
+            workers: 进程数（默认 CPU 核数）
+
+        Returns:
+            LintReport 聚合结果
+        """
+        file_paths = list(file_paths)
+        report = cls()
+        if not file_paths:
+            return report
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        # 文件很少时进程开销不划算，直接串行
+        if workers <= 1 or len(file_paths) <= 1:
+            _init_worker(preset)
+            for file_path in file_paths:
+                report.add_result(_worker_lint(file_path))
+            return report
+
+        chunksize = max(1, len(file_paths) // (4 * workers))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(preset,)
+        ) as executor:
+            for result in executor.map(_worker_lint, file_paths, chunksize=chunksize):
+                report.add_result(result)
+        return report
 
     @property
     def total_errors(self) -> int:
         """总错误数"""
-        return sum(r.error_count for r in self.results)
+        return self._total_errors
 
     @property
     def total_warnings(self) -> int:
         """总警告数"""
-        return sum(r.warning_count for r in self.results)
+        return self._total_warnings
 
     @property
     def total_violations(self) -> int:
         """总违规数"""
-        return sum(len(r.violations) for r in self.results)
+        return self._total_violations
 
     @property
     def files_with_issues(self) -> int:
         """有问题的文件数"""
-        return sum(1 for r in self.results if r.has_issues)
+        return self._files_with_issues
 
     @property
     def total_files(self) -> int:
-        """总文件数"""
-        return len(self.results)
+        """总文件数（流式模式下结果不保留，计数单独维护）"""
+        return self._total_files
 
     @property
     def has_errors(self) -> bool:
         """是否有错误"""
         return self.total_errors > 0
 
+    def iter_violations(self) -> Iterator[RuleViolation]:
+        """惰性遍历所有违规（不额外物化列表，大报告只迭代时省一份拷贝）"""
+        return chain.from_iterable(r.violations for r in self.results)
+
     def get_all_violations(self) -> List[RuleViolation]:
         """获取所有违规"""
-        violations = []
-        for result in self.results:
-            violations.extend(result.violations)
-        return violations
+        return list(self.iter_violations())
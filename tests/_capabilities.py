@@ -0,0 +1,12 @@
+"""
+测试能力探测
+JS/TS 支持与否在此模块导入时探测一次，
+各测试模块共享结果（模块本身就是进程级单例）
+"""
+
+from a_brick_code_analyzer import ParserFactory
+
+_EXTENSIONS = ParserFactory.get_supported_extensions()
+
+JS_SUPPORTED = '.js' in _EXTENSIONS
+TS_SUPPORTED = '.ts' in _EXTENSIONS
@@ -2,8 +2,12 @@
 内置规则测试
 """
 
+import ast
+import copy
 import unittest
 
+import pytest
+
 from a_brick_code_analyzer import PythonParser, Severity
 from a_brick_code_analyzer.rules.builtin.complexity import (
     MaxComplexityRule,
@@ -20,29 +24,43 @@ from a_brick_code_analyzer.rules.builtin.structure import (
     MaxFunctionsPerFileRule,
 )
 
+# 多个测试共用的片段在模块导入时解析一次、共享同一 ParseResult
+# （check() 不修改解析结果，跨测试只读共享是安全的）
+_BAD_NAME_RESULT = PythonParser().parse('def BadName(): pass', 'test.py')
+
+# 生成的超标源码片段（模块级构建一次，各测试复用同一字符串）
+_LONG_FUNCTION_CODE = (
+    'def long_function():\n'
+    + '\n'.join(f'    x{i} = {i}' for i in range(10))
+    + '\n    return x0'
+)
+_MANY_LINES_CODE = '\n'.join(f'x{i} = {i}' for i in range(20))
+_MANY_CLASSES_CODE = '\n'.join(f'class Class{i}:\n    pass\n' for i in range(6))
 
-class TestComplexityRules(unittest.TestCase):
-    """复杂度规则测试"""
+# 函数桩模板：克隆改名生成 N 个函数的 ast.Module，
+# 配合 PythonParser.from_ast 跳过逐次的分词/语法分析
+_FUNC_STUB = ast.parse('def _(): pass').body[0]
 
-    def setUp(self):
-        self.parser = PythonParser()
 
-    def test_max_complexity_pass(self):
-        """测试复杂度通过"""
-        code = '''
+def _make_funcs_module(n):
+    """构造含 n 个顶层函数的 ast.Module"""
+    mod = ast.Module(body=[], type_ignores=[])
+    for i in range(n):
+        func = copy.copy(_FUNC_STUB)
+        func.name = f'func{i}'
+        mod.body.append(func)
+    ast.fix_missing_locations(mod)
+    return mod
+
+
+_SIMPLE_FUNCTION_CODE = """
 def simple_function(x):
     if x > 0:
         return x
     return 0
-'''
-        rule = MaxComplexityRule(options={'max': 10})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        self.assertEqual(len(violations), 0)
+"""
 
-    def test_max_complexity_fail(self):
-        """测试复杂度超标"""
-        code = '''
+_COMPLEX_FUNCTION_CODE = """
 def complex_function(a, b, c):
     if a:
         if b:
@@ -52,81 +70,88 @@ def complex_function(a, b, c):
                         while True:
                             break
     return 0
-'''
-        rule = MaxComplexityRule(options={'max': 3})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        self.assertEqual(len(violations), 1)
-        self.assertIn('complex_function', violations[0].message)
+"""
 
-    def test_max_function_lines_pass(self):
-        """测试函数行数通过"""
-        code = '''
+_SHORT_FUNCTION_CODE = """
 def short_function():
     x = 1
     y = 2
     return x + y
-'''
-        rule = MaxFunctionLinesRule(options={'max': 10})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        self.assertEqual(len(violations), 0)
-
-    def test_max_function_lines_fail(self):
-        """测试函数行数超标"""
-        # 创建一个超过 5 行的函数
-        lines = ['def long_function():']
-        for i in range(10):
-            lines.append(f'    x{i} = {i}')
-        lines.append('    return x0')
-        code = '\n'.join(lines)
-
-        rule = MaxFunctionLinesRule(options={'max': 5})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        self.assertEqual(len(violations), 1)
+"""
 
-    def test_max_params_pass(self):
-        """测试参数数量通过"""
-        code = '''
+_FEW_PARAMS_CODE = """
 def few_params(a, b, c):
     return a + b + c
-'''
-        rule = MaxParamsRule(options={'max': 5})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        self.assertEqual(len(violations), 0)
+"""
 
-    def test_max_params_fail(self):
-        """测试参数数量超标"""
-        code = '''
+_MANY_PARAMS_CODE = """
 def many_params(a, b, c, d, e, f, g):
     pass
-'''
-        rule = MaxParamsRule(options={'max': 5})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        self.assertEqual(len(violations), 1)
+"""
 
-    def test_max_params_excludes_self(self):
-        """测试参数数量排除 self"""
-        code = '''
+_METHOD_PARAMS_CODE = """
 class MyClass:
     def method(self, a, b, c, d, e):
         pass
-'''
-        rule = MaxParamsRule(options={'max': 5})
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
-        # self 不计入，所以只有 5 个参数，刚好通过
-        self.assertEqual(len(violations), 0)
+"""
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """解析器无状态，整个模块共享一个实例"""
+    return PythonParser()
+
+
+@pytest.mark.parametrize("code,options,expected", [
+    # 通过：复杂度低于阈值
+    (_SIMPLE_FUNCTION_CODE, {'max': 10}, 0),
+    # 超标：多层嵌套分支
+    (_COMPLEX_FUNCTION_CODE, {'max': 3}, 1),
+])
+def test_max_complexity(parser, code, options, expected):
+    """测试圈复杂度检查"""
+    rule = MaxComplexityRule(options=options)
+    violations = rule.check(parser.parse(code, "test.py"))
+    assert len(violations) == expected
+    if violations:
+        # 直接比较结构化字段，不对人读消息做子串扫描
+        assert violations[0].node_name == 'complex_function'
+
+
+@pytest.mark.parametrize("code,options,expected", [
+    # 通过：函数行数在限制内
+    (_SHORT_FUNCTION_CODE, {'max': 10}, 0),
+    # 超标：超过 5 行的函数
+    (_LONG_FUNCTION_CODE, {'max': 5}, 1),
+])
+def test_max_function_lines(parser, code, options, expected):
+    """测试函数行数检查"""
+    rule = MaxFunctionLinesRule(options=options)
+    violations = rule.check(parser.parse(code, "test.py"))
+    assert len(violations) == expected
+
+
+@pytest.mark.parametrize("code,options,expected", [
+    # 通过：参数数量在限制内
+    (_FEW_PARAMS_CODE, {'max': 5}, 0),
+    # 超标：7 个参数
+    (_MANY_PARAMS_CODE, {'max': 5}, 1),
+    # self 不计入，所以只有 5 个参数，刚好通过
+    (_METHOD_PARAMS_CODE, {'max': 5}, 0),
+])
+def test_max_params(parser, code, options, expected):
+    """测试参数数量检查"""
+    rule = MaxParamsRule(options=options)
+    violations = rule.check(parser.parse(code, "test.py"))
+    assert len(violations) == expected
 
 
 class TestNamingRules(unittest.TestCase):
     """命名规则测试"""
 
-    def setUp(self):
-        self.parser = PythonParser()
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = PythonParser()
 
     def test_function_naming_snake_case_pass(self):
         """测试函数 snake_case 命名通过"""
@@ -215,8 +240,9 @@ class anotherClass:
 class TestStructureRules(unittest.TestCase):
     """结构规则测试"""
 
-    def setUp(self):
-        self.parser = PythonParser()
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = PythonParser()
 
     def test_max_file_lines_pass(self):
         """测试文件行数通过"""
@@ -234,9 +260,8 @@ def func2():
 
     def test_max_file_lines_fail(self):
         """测试文件行数超标"""
-        # 创建超过 10 行的代码
-        lines = [f'x{i} = {i}' for i in range(20)]
-        code = '\n'.join(lines)
+        # 超过 10 行的代码
+        code = _MANY_LINES_CODE
 
         rule = MaxFileLinesRule(options={'max': 10})
         parse_result = self.parser.parse(code, "test.py")
@@ -259,8 +284,7 @@ class Class2:
 
     def test_max_classes_per_file_fail(self):
         """测试每文件类数量超标"""
-        classes = [f'class Class{i}:\n    pass\n' for i in range(6)]
-        code = '\n'.join(classes)
+        code = _MANY_CLASSES_CODE
 
         rule = MaxClassesPerFileRule(options={'max': 3})
         parse_result = self.parser.parse(code, "test.py")
@@ -283,11 +307,8 @@ def func2():
 
     def test_max_functions_per_file_fail(self):
         """测试每文件函数数量超标"""
-        functions = [f'def func{i}():\n    pass\n' for i in range(10)]
-        code = '\n'.join(functions)
-
         rule = MaxFunctionsPerFileRule(options={'max': 5})
-        parse_result = self.parser.parse(code, "test.py")
+        parse_result = self.parser.from_ast(_make_funcs_module(10), "test.py")
         violations = rule.check(parse_result)
         self.assertEqual(len(violations), 1)
 
@@ -295,32 +316,28 @@ def func2():
 class TestRuleSeverity(unittest.TestCase):
     """规则严重级别测试"""
 
-    def setUp(self):
-        self.parser = PythonParser()
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = PythonParser()
 
     def test_rule_severity_warn(self):
         """测试警告级别"""
-        code = 'def BadName(): pass'
         rule = FunctionNamingRule(severity=Severity.WARN)
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
+        violations = rule.check(_BAD_NAME_RESULT)
 
         self.assertEqual(len(violations), 1)
         self.assertEqual(violations[0].severity, Severity.WARN)
 
     def test_rule_severity_error(self):
         """测试错误级别"""
-        code = 'def BadName(): pass'
         rule = FunctionNamingRule(severity=Severity.ERROR)
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
+        violations = rule.check(_BAD_NAME_RESULT)
 
         self.assertEqual(len(violations), 1)
         self.assertEqual(violations[0].severity, Severity.ERROR)
 
     def test_rule_disabled(self):
         """测试禁用规则"""
-        code = 'def BadName(): pass'
         rule = FunctionNamingRule(severity=Severity.OFF)
 
         self.assertFalse(rule.is_enabled())
@@ -329,8 +346,9 @@ class TestRuleSeverity(unittest.TestCase):
 class TestRuleViolationMetadata(unittest.TestCase):
     """规则违规元数据测试"""
 
-    def setUp(self):
-        self.parser = PythonParser()
+    @classmethod
+    def setUpClass(cls):
+        cls.parser = PythonParser()
 
     def test_violation_has_metadata(self):
         """测试违规包含元数据"""
@@ -354,10 +372,8 @@ def func(a, b, c, d, e, f, g):
 
     def test_violation_has_suggestion(self):
         """测试违规包含建议"""
-        code = 'def BadName(): pass'
         rule = FunctionNamingRule()
-        parse_result = self.parser.parse(code, "test.py")
-        violations = rule.check(parse_result)
+        violations = rule.check(_BAD_NAME_RESULT)
 
         self.assertEqual(len(violations), 1)
         self.assertIsNotNone(violations[0].suggestion)
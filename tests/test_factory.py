@@ -5,12 +5,15 @@
 import unittest
 from a_brick_code_analyzer import ParserFactory, PythonParser
 
-# 检查是否支持 JavaScript/TypeScript
-try:
-    from a_brick_code_analyzer import JavaScriptParser, TypeScriptParser
-    JAVASCRIPT_SUPPORT = True
-except ImportError:
-    JAVASCRIPT_SUPPORT = False
+# 检查是否支持 JavaScript/TypeScript（探测结果跨测试模块共享）
+from tests._capabilities import JS_SUPPORTED, TS_SUPPORTED
+
+JAVASCRIPT_SUPPORT = JS_SUPPORTED and TS_SUPPORTED
+if JAVASCRIPT_SUPPORT:
+    from a_brick_code_analyzer.javascript_parser import (
+        JavaScriptParser,
+        TypeScriptParser,
+    )
 
 
 class TestParserFactory(unittest.TestCase):
@@ -42,13 +45,13 @@ class TestParserFactory(unittest.TestCase):
         """测试获取支持的语言列表"""
         languages = ParserFactory.get_supported_languages()
         self.assertIn('python', languages)
-        self.assertIsInstance(languages, list)
+        self.assertIsInstance(languages, tuple)
 
     def test_get_supported_extensions(self):
         """测试获取支持的扩展名列表"""
         extensions = ParserFactory.get_supported_extensions()
         self.assertIn('.py', extensions)
-        self.assertIsInstance(extensions, list)
+        self.assertIsInstance(extensions, tuple)
 
     @unittest.skipUnless(JAVASCRIPT_SUPPORT, "JavaScript support not available")
     def test_get_javascript_parser_by_language(self):
@@ -85,7 +88,7 @@ class TestParserFactory(unittest.TestCase):
         self.assertIn('python', languages)
         self.assertIn('javascript', languages)
         self.assertIn('typescript', languages)
-        self.assertIsInstance(languages, list)
+        self.assertIsInstance(languages, tuple)
 
     @unittest.skipUnless(JAVASCRIPT_SUPPORT, "JavaScript support not available")
     def test_get_supported_extensions_with_js_ts(self):
@@ -96,7 +99,7 @@ class TestParserFactory(unittest.TestCase):
         self.assertIn('.jsx', extensions)
         self.assertIn('.ts', extensions)
         self.assertIn('.tsx', extensions)
-        self.assertIsInstance(extensions, list)
+        self.assertIsInstance(extensions, tuple)
 
 
 if __name__ == '__main__':
@@ -2,46 +2,54 @@
 测试 JavaScript/TypeScript 解析器
 """
 
-import unittest
-from unittest.mock import patch
+import pytest
+
 from a_brick_code_analyzer import ParserFactory
 
+from tests._capabilities import JS_SUPPORTED, TS_SUPPORTED
+
+js_only = pytest.mark.skipif(
+    not JS_SUPPORTED, reason="JavaScript support not available")
+ts_only = pytest.mark.skipif(
+    not TS_SUPPORTED, reason="TypeScript support not available")
+
+
+@pytest.fixture(scope="module")
+def js_parser():
+    """语法加载只做一次，整个模块共享 JavaScript 解析器"""
+    return ParserFactory.get_parser('javascript')
+
 
-class TestJavaScriptParser(unittest.TestCase):
-    """测试 JavaScript 解析器"""
+@pytest.fixture(scope="module")
+def ts_parser():
+    """语法加载只做一次，整个模块共享 TypeScript 解析器"""
+    return ParserFactory.get_parser('typescript')
 
-    def setUp(self):
-        """初始化测试"""
-        # 检查是否支持 JavaScript
-        self.js_supported = '.js' in ParserFactory.get_supported_extensions()
-        if self.js_supported:
-            self.parser = ParserFactory.get_parser('javascript')
-        else:
-            self.parser = None
 
-    @unittest.skipUnless(lambda self: self.js_supported, "JavaScript support not available")
-    def test_parse_simple_function(self):
-        """测试解析简单函数"""
-        code = '''
+@js_only
+def test_parse_simple_function(js_parser):
+    """测试解析简单函数"""
+    code = b'''
 function hello(name) {
     // Say hello
     return `Hello, ${name}!`;
 }
 '''
-        result = self.parser.parse(code)
+    result = js_parser.parse_bytes(code)
 
-        self.assertEqual(result.language, "javascript")
-        self.assertEqual(len(result.nodes), 1)
+    assert result.language == "javascript"
+    assert len(result.nodes) == 1
 
-        func = result.nodes[0]
-        self.assertEqual(func.name, "hello")
-        self.assertEqual(func.params, ["name"])
-        self.assertGreater(func.complexity, 0)
+    func = result.nodes[0]
+    assert func.name == "hello"
+    assert func.params == ["name"]
+    assert func.complexity > 0
 
-    @unittest.skipUnless(lambda self: self.js_supported, "JavaScript support not available")
-    def test_parse_class(self):
-        """测试解析类"""
-        code = '''
+
+@js_only
+def test_parse_class(js_parser):
+    """测试解析类"""
+    code = b'''
 class Calculator {
     // A simple calculator
 
@@ -56,36 +64,38 @@ class Calculator {
     }
 }
 '''
-        result = self.parser.parse(code)
+    result = js_parser.parse_bytes(code)
+
+    # 应该有 1 个类和 2 个方法
+    classes = [node for node in result.nodes if node.node_type.name == 'CLASS']
+    methods = [node for node in result.nodes if node.node_type.name == 'METHOD']
 
-        # 应该有 1 个类和 2 个方法
-        classes = [node for node in result.nodes if node.node_type.name == 'CLASS']
-        methods = [node for node in result.nodes if node.node_type.name == 'METHOD']
+    assert len(classes) == 1
+    assert len(methods) == 2
 
-        self.assertEqual(len(classes), 1)
-        self.assertEqual(len(methods), 2)
+    calc_class = classes[0]
+    assert calc_class.name == "Calculator"
 
-        calc_class = classes[0]
-        self.assertEqual(calc_class.name, "Calculator")
 
-    @unittest.skipUnless(lambda self: self.js_supported, "JavaScript support not available")
-    def test_parse_imports(self):
-        """测试解析导入语句"""
-        code = '''
+@js_only
+def test_parse_imports(js_parser):
+    """测试解析导入语句"""
+    code = b'''
 import React from 'react';
 import { useState, useEffect } from 'react';
 import * as utils from './utils';
 const fs = require('fs');
 '''
-        result = self.parser.parse(code)
+    result = js_parser.parse_bytes(code)
 
-        # 应该包含导入语句
-        self.assertTrue(len(result.imports) > 0)
+    # 应该包含导入语句
+    assert len(result.imports) > 0
 
-    @unittest.skipUnless(lambda self: self.js_supported, "JavaScript support not available")
-    def test_complexity_calculation(self):
-        """测试复杂度计算"""
-        code = '''
+
+@js_only
+def test_complexity_calculation(js_parser):
+    """测试复杂度计算"""
+    code = b'''
 function complexFunction(x) {
     if (x > 0) {
         for (let i = 0; i < x; i++) {
@@ -101,16 +111,17 @@ function complexFunction(x) {
     return x;
 }
 '''
-        result = self.parser.parse(code)
+    result = js_parser.parse_bytes(code)
+
+    func = result.nodes[0]
+    # 应该有较高的复杂度（多个分支）
+    assert func.complexity > 3
 
-        func = result.nodes[0]
-        # 应该有较高的复杂度（多个分支）
-        self.assertGreater(func.complexity, 3)
 
-    @unittest.skipUnless(lambda self: self.js_supported, "JavaScript support not available")
-    def test_line_counting(self):
-        """测试行数统计"""
-        code = '''// This is a comment
+@js_only
+def test_line_counting(js_parser):
+    """测试行数统计"""
+    code = b'''// This is a comment
 import React from 'react';
 
 function hello() {
@@ -120,59 +131,50 @@ function hello() {
 
 // Another comment
 '''
-        result = self.parser.parse(code)
+    result = js_parser.parse_bytes(code)
 
-        self.assertGreater(result.total_lines, 0)
-        self.assertGreater(result.comment_lines, 0)
-        self.assertGreater(result.blank_lines, 0)
-        self.assertGreater(result.code_lines, 0)
+    assert result.total_lines > 0
+    assert result.comment_lines > 0
+    assert result.blank_lines > 0
+    assert result.code_lines > 0
 
-    @unittest.skipUnless(lambda self: self.js_supported, "JavaScript support not available")
-    def test_syntax_error_handling(self):
-        """测试语法错误处理"""
-        code = '''
+
+@js_only
+def test_syntax_error_handling(js_parser):
+    """测试语法错误处理"""
+    # 注释含非 ASCII 字符，不能写成 bytes 字面量，这里单独编码
+    code = '''
 function brokenFunction( {
     // 缺少闭合括号
-'''
-        result = self.parser.parse(code)
-
-        self.assertTrue(len(result.errors) > 0)
-
+'''.encode('utf-8')
+    result = js_parser.parse_bytes(code)
 
-class TestTypeScriptParser(unittest.TestCase):
-    """测试 TypeScript 解析器"""
+    assert len(result.errors) > 0
 
-    def setUp(self):
-        """初始化测试"""
-        # 检查是否支持 TypeScript
-        self.ts_supported = '.ts' in ParserFactory.get_supported_extensions()
-        if self.ts_supported:
-            self.parser = ParserFactory.get_parser('typescript')
-        else:
-            self.parser = None
 
-    @unittest.skipUnless(lambda self: self.ts_supported, "TypeScript support not available")
-    def test_parse_typescript_function(self):
-        """测试解析 TypeScript 函数"""
-        code = '''
+@ts_only
+def test_parse_typescript_function(ts_parser):
+    """测试解析 TypeScript 函数"""
+    code = b'''
 function greet(name: string): string {
     // Say hello with type annotations
     return `Hello, ${name}!`;
 }
 '''
-        result = self.parser.parse(code)
+    result = ts_parser.parse_bytes(code)
 
-        self.assertEqual(result.language, "typescript")
-        self.assertEqual(len(result.nodes), 1)
+    assert result.language == "typescript"
+    assert len(result.nodes) == 1
 
-        func = result.nodes[0]
-        self.assertEqual(func.name, "greet")
-        self.assertEqual(func.params, ["name"])
+    func = result.nodes[0]
+    assert func.name == "greet"
+    assert func.params == ["name"]
 
-    @unittest.skipUnless(lambda self: self.ts_supported, "TypeScript support not available")
-    def test_parse_typescript_class(self):
-        """测试解析 TypeScript 类"""
-        code = '''
+
+@ts_only
+def test_parse_typescript_class(ts_parser):
+    """测试解析 TypeScript 类"""
+    code = b'''
 class Calculator {
     private result: number = 0;
 
@@ -186,31 +188,28 @@ class Calculator {
     }
 }
 '''
-        result = self.parser.parse(code)
+    result = ts_parser.parse_bytes(code)
+
+    # 应该有 1 个类和 2 个方法
+    classes = [node for node in result.nodes if node.node_type.name == 'CLASS']
+    methods = [node for node in result.nodes if node.node_type.name == 'METHOD']
 
-        # 应该有 1 个类和 2 个方法
-        classes = [node for node in result.nodes if node.node_type.name == 'CLASS']
-        methods = [node for node in result.nodes if node.node_type.name == 'METHOD']
+    assert len(classes) == 1
+    assert len(methods) == 2
 
-        self.assertEqual(len(classes), 1)
-        self.assertEqual(len(methods), 2)
+    calc_class = classes[0]
+    assert calc_class.name == "Calculator"
 
-        calc_class = classes[0]
-        self.assertEqual(calc_class.name, "Calculator")
 
-    @unittest.skipUnless(lambda self: self.ts_supported, "TypeScript support not available")
-    def test_parse_typescript_imports(self):
-        """测试解析 TypeScript 导入语句"""
-        code = '''
+@ts_only
+def test_parse_typescript_imports(ts_parser):
+    """测试解析 TypeScript 导入语句"""
+    code = b'''
 import { Component, OnInit } from '@angular/core';
 import * as _ from 'lodash';
 import { Observable } from 'rxjs';
 '''
-        result = self.parser.parse(code)
-
-        # 应该包含导入语句
-        self.assertTrue(len(result.imports) > 0)
-
+    result = ts_parser.parse_bytes(code)
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    # 应该包含导入语句
+    assert len(result.imports) > 0
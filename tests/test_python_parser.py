@@ -2,39 +2,42 @@
 测试 Python 解析器
 """
 
-import unittest
+import ast
+
+import pytest
+
 from a_brick_code_analyzer import PythonParser, NodeType
 
 
-class TestPythonParser(unittest.TestCase):
-    """测试 Python 解析器"""
+@pytest.fixture(scope="module")
+def parser():
+    """解析器无状态，整个模块共享一个实例"""
+    return PythonParser()
 
-    def setUp(self):
-        """初始化测试"""
-        self.parser = PythonParser()
 
-    def test_parse_simple_function(self):
-        """测试解析简单函数"""
-        code = '''
+def test_parse_simple_function(parser):
+    """测试解析简单函数"""
+    code = '''
 def hello(name):
     """Say hello"""
     return f"Hello, {name}!"
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
+
+    assert result.language == "python"
+    assert len(result.nodes) == 1
 
-        self.assertEqual(result.language, "python")
-        self.assertEqual(len(result.nodes), 1)
+    func = result.nodes[0]
+    assert func.node_type == NodeType.FUNCTION
+    assert func.name == "hello"
+    assert func.params == ["name"]
+    assert func.docstring == "Say hello"
+    assert func.complexity > 0
 
-        func = result.nodes[0]
-        self.assertEqual(func.node_type, NodeType.FUNCTION)
-        self.assertEqual(func.name, "hello")
-        self.assertEqual(func.params, ["name"])
-        self.assertEqual(func.docstring, "Say hello")
-        self.assertGreater(func.complexity, 0)
 
-    def test_parse_class(self):
-        """测试解析类"""
-        code = '''
+def test_parse_class(parser):
+    """测试解析类"""
+    code = '''
 class Calculator:
     """A simple calculator"""
 
@@ -46,53 +49,56 @@ class Calculator:
         """Subtract two numbers"""
         return a - b
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
 
-        # 应该有 1 个类和 2 个方法
-        classes = result.get_classes()
-        methods = result.get_methods()
+    # 应该有 1 个类和 2 个方法
+    classes = result.get_classes()
+    methods = result.get_methods()
 
-        self.assertEqual(len(classes), 1)
-        self.assertEqual(len(methods), 2)
+    assert len(classes) == 1
+    assert len(methods) == 2
 
-        calc_class = classes[0]
-        self.assertEqual(calc_class.name, "Calculator")
-        self.assertEqual(calc_class.docstring, "A simple calculator")
+    calc_class = classes[0]
+    assert calc_class.name == "Calculator"
+    assert calc_class.docstring == "A simple calculator"
 
-    def test_parse_decorators(self):
-        """测试解析装饰器"""
-        code = '''
+
+def test_parse_decorators(parser):
+    """测试解析装饰器"""
+    code = '''
 @staticmethod
 @cache
 def compute(x):
     return x * 2
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
+
+    func = result.nodes[0]
+    assert len(func.decorators) == 2
+    assert "staticmethod" in func.decorators
+    assert "cache" in func.decorators
 
-        func = result.nodes[0]
-        self.assertEqual(len(func.decorators), 2)
-        self.assertIn("staticmethod", func.decorators)
-        self.assertIn("cache", func.decorators)
 
-    def test_parse_imports(self):
-        """测试解析导入语句"""
-        code = '''
+def test_parse_imports(parser):
+    """测试解析导入语句"""
+    code = '''
 import os
 import sys
 from pathlib import Path
 from typing import List, Dict
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
 
-        self.assertIn("os", result.imports)
-        self.assertIn("sys", result.imports)
-        self.assertIn("pathlib.Path", result.imports)
-        self.assertIn("typing.List", result.imports)
-        self.assertIn("typing.Dict", result.imports)
+    assert "os" in result.imports
+    assert "sys" in result.imports
+    assert "pathlib.Path" in result.imports
+    assert "typing.List" in result.imports
+    assert "typing.Dict" in result.imports
 
-    def test_complexity_calculation(self):
-        """测试复杂度计算"""
-        code = '''
+
+def test_complexity_calculation(parser):
+    """测试复杂度计算"""
+    code = '''
 def complex_function(x):
     if x > 0:
         for i in range(x):
@@ -103,15 +109,16 @@ def complex_function(x):
             x += 1
     return x
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
+
+    func = result.nodes[0]
+    # 应该有较高的复杂度（多个分支）
+    assert func.complexity > 3
 
-        func = result.nodes[0]
-        # 应该有较高的复杂度（多个分支）
-        self.assertGreater(func.complexity, 3)
 
-    def test_line_counting(self):
-        """测试行数统计"""
-        code = '''# This is a comment
+def test_line_counting(parser):
+    """测试行数统计"""
+    code = '''# This is a comment
 import os
 
 def hello():
@@ -120,37 +127,45 @@ def hello():
 
 # Another comment
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
+
+    assert result.total_lines > 0
+    assert result.comment_lines > 0
+    assert result.blank_lines > 0
+    assert result.code_lines > 0
 
-        self.assertGreater(result.total_lines, 0)
-        self.assertGreater(result.comment_lines, 0)
-        self.assertGreater(result.blank_lines, 0)
-        self.assertGreater(result.code_lines, 0)
 
-    def test_syntax_error_handling(self):
-        """测试语法错误处理"""
-        code = '''
+def test_syntax_error_handling(parser):
+    """测试语法错误处理"""
+    code = '''
 def broken_function(
     # 缺少闭合括号
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
 
-        self.assertTrue(len(result.errors) > 0)
-        self.assertIn("语法错误", result.errors[0])
+    assert len(result.errors) > 0
+    assert "语法错误" in result.errors[0]
 
-    def test_async_function(self):
-        """测试异步函数"""
-        code = '''
+
+def test_async_function(parser):
+    """测试异步函数"""
+    code = '''
 async def fetch_data(url):
     """Fetch data asynchronously"""
     return await get(url)
 '''
-        result = self.parser.parse(code)
+    result = parser.parse(code)
+
+    func = result.nodes[0]
+    assert func.name == "fetch_data"
+    assert func.metadata.get('is_async')
 
-        func = result.nodes[0]
-        self.assertEqual(func.name, "fetch_data")
-        self.assertTrue(func.metadata.get('is_async'))
 
+def test_from_ast(parser):
+    """测试直接从 AST 构建解析结果"""
+    tree = ast.parse('def hello(name):\n    return name\n')
+    result = parser.from_ast(tree, "test.py")
 
-if __name__ == '__main__':
-    unittest.main()
+    assert len(result.nodes) == 1
+    assert result.nodes[0].name == "hello"
+    assert result.total_lines == 2